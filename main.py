@@ -8,14 +8,8 @@ import logging
 import signal
 import sys
 import os
-from pathlib import Path
-
-# Add src to path
-sys.path.append(str(Path(__file__).parent / "src"))
 
 from src.config import Config
-from src.multi_strategy_agent import MultiStrategyAgent
-from src.web_dashboard import WebDashboard
 
 # Configure logging
 logging.basicConfig(
@@ -31,19 +25,27 @@ logger = logging.getLogger(__name__)
 
 async def main():
     """Main entry point"""
+    # Run short coroutines inline up to their first suspension (Python 3.12+)
+    if hasattr(asyncio, "eager_task_factory"):
+        asyncio.get_running_loop().set_task_factory(asyncio.eager_task_factory)
+
     try:
         logger.info("🚀 Starting Stock Market Trading Agent...")
         logger.info(f"Python version: {sys.version}")
         logger.info(f"Working directory: {os.getcwd()}")
-        logger.info(f"Files in directory: {os.listdir('.')}")
-        logger.info(f"Environment variables: PORT={os.environ.get('PORT', 'Not set')}")
+        if os.environ.get("STARTUP_DEBUG"):
+            with os.scandir(".") as entries:
+                logger.info(f"Files in directory: {[e.name for e in entries]}")
+            logger.info(
+                f"Environment variables: PORT={os.environ.get('PORT', 'Not set')}"
+            )
 
         # Check if config.yaml exists
-        config_path = Path("config.yaml")
-        if not config_path.exists():
-            logger.error(f"❌ config.yaml not found at {config_path.absolute()}")
+        config_path = "config.yaml"
+        if not os.path.exists(config_path):
+            logger.error(f"❌ config.yaml not found at {os.path.abspath(config_path)}")
             raise FileNotFoundError(
-                f"config.yaml not found at {config_path.absolute()}"
+                f"config.yaml not found at {os.path.abspath(config_path)}"
             )
 
         # Load configuration
@@ -51,6 +53,10 @@ async def main():
         config = Config.from_file("config.yaml")
         logger.info("📋 Configuration loaded successfully")
 
+        # Deferred so pandas/yfinance/FastAPI load only once config is known good
+        from src.multi_strategy_agent import MultiStrategyAgent
+        from src.web_dashboard import WebDashboard
+
         # Initialize multi-strategy trading agent
         logger.info("🤖 Initializing multi-strategy trading agent...")
         trading_agent = MultiStrategyAgent(config)
@@ -66,17 +72,33 @@ async def main():
         config.system.dashboard_port = port
         logger.info(f"🎯 Using port: {port}")
 
-        # Setup signal handlers for graceful shutdown
-        def signal_handler(signum, frame):
-            logger.info("🛑 Received shutdown signal")
-            asyncio.create_task(shutdown())
+        # Setup signal handlers for graceful shutdown: stopping the server
+        # returns from dashboard.start(), and shutdown() runs after it
+        stopping = False
 
-        signal.signal(signal.SIGINT, signal_handler)
-        signal.signal(signal.SIGTERM, signal_handler)
+        def signal_handler():
+            # uvicorn re-raises the signal it captured once the server stops
+            nonlocal stopping
+            if stopping:
+                return
+            stopping = True
+            logger.info("🛑 Received shutdown signal")
+            dashboard.stop()
+
+        if sys.platform == "win32":
+            # The Windows event loop has no add_signal_handler
+            for sig in (signal.SIGINT, signal.SIGTERM):
+                signal.signal(sig, lambda signum, frame: signal_handler())
+        else:
+            # Dispatched on the loop itself, not in the middle of a callback
+            loop = asyncio.get_running_loop()
+            for sig in (signal.SIGINT, signal.SIGTERM):
+                loop.add_signal_handler(sig, signal_handler)
 
         # Start the web dashboard
         logger.info("🚀 Starting web dashboard...")
         await dashboard.start()
+        await shutdown(trading_agent, dashboard)
 
     except FileNotFoundError as e:
         logger.error(f"❌ File not found: {e}")
@@ -94,13 +116,24 @@ async def main():
         sys.exit(1)
 
 
-async def shutdown():
+async def shutdown(trading_agent, dashboard):
     """Graceful shutdown"""
     logger.info("🛑 Starting graceful shutdown")
-    sys.exit(0)
+    # Each strategy's PortfolioManager.shutdown() commits its queued trades
+    # and positions before closing the databases
+    await trading_agent.shutdown()
+    await dashboard.shutdown()
 
 
 if __name__ == "__main__":
+    try:
+        # libuv-based event loop; not available on Windows, so fall back silently
+        import uvloop
+
+        uvloop.install()
+    except ImportError:
+        pass
+
     try:
         asyncio.run(main())
     except KeyboardInterrupt:
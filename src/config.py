@@ -4,12 +4,43 @@ Configuration management for the trading agent
 
 import yaml
 import os
-from pathlib import Path
-from dataclasses import dataclass
+import copy
+import functools
+import pickle
+from dataclasses import dataclass, field, fields
 from typing import Optional, List
 
+try:
+    # LibYAML C bindings parse/emit several times faster than pure Python
+    from yaml import CSafeLoader as SafeLoader, CSafeDumper as SafeDumper
+except ImportError:
+    from yaml import SafeLoader, SafeDumper
 
-@dataclass
+__all__ = [
+    "Config",
+    "TradingConfig",
+    "ResearchConfig",
+    "SystemConfig",
+    "VirtualTradingConfig",
+    "RealTradingConfig",
+    "NotificationConfig",
+    "LearningConfig",
+    "StrategyLimits",
+    "load_yaml",
+    "SafeDumper",
+]
+
+# Default research.news_sources; copied into a list per ResearchConfig
+_DEFAULT_NEWS_SOURCES = (
+    "https://finance.yahoo.com/news",
+    "https://www.marketwatch.com/news",
+    "https://seekingalpha.com/news",
+    "https://www.cnbc.com/markets",
+    "https://www.bloomberg.com/markets",
+)
+
+
+@dataclass(slots=True)
 class TradingConfig:
     mode: str = "virtual"  # "virtual" or "real"
     account_balance: float = 10000.0
@@ -20,11 +51,16 @@ class TradingConfig:
     alpaca_api_key: str = ""
     alpaca_secret_key: str = ""
     alpaca_paper_trading: bool = True
+    # Per-strategy overrides filled in by MultiStrategyAgent.create_strategy_config
+    min_score_threshold: float = 0.1
+    max_risk_score: float = 0.8
+    name: str = ""
+    description: str = ""
 
 
-@dataclass
+@dataclass(slots=True)
 class ResearchConfig:
-    news_sources: List[str] = None
+    news_sources: List[str] = field(default_factory=lambda: list(_DEFAULT_NEWS_SOURCES))
     sentiment_threshold: float = 0.3
     trend_analysis_window: int = 14
     max_research_time: int = 300
@@ -32,18 +68,21 @@ class ResearchConfig:
     trading_start_time: str = "09:30"
 
 
-@dataclass
+@dataclass(slots=True)
 class SystemConfig:
     database_url: str = "sqlite:///trading_data.db"
     log_level: str = "INFO"
     dashboard_host: str = "0.0.0.0"
     dashboard_port: int = 8000
+    # Unix socket path to serve the dashboard on instead of host:port, for
+    # a reverse proxy on the same host
+    dashboard_uds: Optional[str] = None
     max_daily_trades: int = 10
     max_daily_loss: float = 5.0
     emergency_stop_loss: float = 10.0
 
 
-@dataclass
+@dataclass(slots=True)
 class VirtualTradingConfig:
     simulate_slippage: bool = True
     simulate_commissions: bool = True
@@ -52,7 +91,7 @@ class VirtualTradingConfig:
     margin_trading: bool = False
 
 
-@dataclass
+@dataclass(slots=True)
 class RealTradingConfig:
     broker: str = "alpaca"
     require_confirmation: bool = True
@@ -64,7 +103,7 @@ class RealTradingConfig:
     after_hours_end: str = "20:00"
 
 
-@dataclass
+@dataclass(slots=True)
 class NotificationConfig:
     email_enabled: bool = False
     email_address: str = ""
@@ -76,7 +115,7 @@ class NotificationConfig:
     notify_on_daily_summary: bool = True
 
 
-@dataclass
+@dataclass(slots=True)
 class LearningConfig:
     track_performance: bool = True
     performance_window: int = 30
@@ -86,7 +125,7 @@ class LearningConfig:
     backtest_days: int = 90
 
 
-@dataclass
+@dataclass(slots=True)
 class Config:
     trading: TradingConfig = None
     research: ResearchConfig = None
@@ -96,6 +135,17 @@ class Config:
     notifications: NotificationConfig = None
     learning: LearningConfig = None
 
+    # Section -> field names, resolved once so save() only has to fill in values
+    _SCHEMA = {
+        "trading": tuple(f.name for f in fields(TradingConfig)),
+        "research": tuple(f.name for f in fields(ResearchConfig)),
+        "system": tuple(f.name for f in fields(SystemConfig)),
+        "virtual_trading": tuple(f.name for f in fields(VirtualTradingConfig)),
+        "real_trading": tuple(f.name for f in fields(RealTradingConfig)),
+        "notifications": tuple(f.name for f in fields(NotificationConfig)),
+        "learning": tuple(f.name for f in fields(LearningConfig)),
+    }
+
     def __post_init__(self):
         # Initialize with defaults if not provided
         if self.trading is None:
@@ -113,120 +163,153 @@ class Config:
         if self.learning is None:
             self.learning = LearningConfig()
 
-        if self.research.news_sources is None:
-            self.research.news_sources = [
-                "https://finance.yahoo.com/news",
-                "https://www.marketwatch.com/news",
-                "https://seekingalpha.com/news",
-                "https://www.cnbc.com/markets",
-                "https://www.bloomberg.com/markets",
-            ]
-
     @classmethod
     def from_file(cls, config_path: str = "config.yaml") -> "Config":
         """Load configuration from YAML file"""
-        if os.path.exists(config_path):
-            with open(config_path, "r") as f:
-                data = yaml.safe_load(f)
-
-                # Extract nested configurations with safe defaults
-                trading_data = data.get("trading", {})
-                research_data = data.get("research", {})
-                system_data = data.get("system", {})
-                virtual_data = data.get("virtual_trading", {})
-                real_data = data.get("real_trading", {})
-                notification_data = data.get("notifications", {})
-                learning_data = data.get("learning", {})
-
-                # Create config objects with safe defaults
-                trading_config = TradingConfig(**trading_data)
-                research_config = ResearchConfig(**research_data)
-                system_config = SystemConfig(**system_data)
-                virtual_config = VirtualTradingConfig(**virtual_data)
-                real_config = RealTradingConfig(**real_data)
-                notification_config = NotificationConfig(**notification_data)
-                learning_config = LearningConfig(**learning_data)
-
-                return cls(
-                    trading=trading_config,
-                    research=research_config,
-                    system=system_config,
-                    virtual_trading=virtual_config,
-                    real_trading=real_config,
-                    notifications=notification_config,
-                    learning=learning_config,
-                )
-
-        # Return default configuration if file doesn't exist
-        return cls()
+        try:
+            mtime = os.path.getmtime(config_path)
+        except FileNotFoundError:
+            # Return default configuration if file doesn't exist
+            return cls()
+
+        # Memoized per (path, mtime); callers mutate their config, so copy it
+        config = _load_config_cached(os.path.abspath(config_path), mtime)
+        return copy.deepcopy(config)
+
+    @classmethod
+    def _parse_file(cls, config_path: str) -> "Config":
+        """Parse the YAML file, going through the pickled sidecar when it is fresh"""
+        # Reuse the pickled sidecar if it is at least as new as the YAML
+        cache_path = f"{config_path}.cache.pkl"
+        cached = _read_config_cache(config_path, cache_path)
+        if cached is not None:
+            return cached
+
+        data = load_yaml(config_path)
+
+        # Extract nested configurations with safe defaults
+        trading_data = data.get("trading", {})
+        research_data = data.get("research", {})
+        system_data = data.get("system", {})
+        virtual_data = data.get("virtual_trading", {})
+        real_data = data.get("real_trading", {})
+        notification_data = data.get("notifications", {})
+        learning_data = data.get("learning", {})
+
+        # Create config objects with safe defaults
+        trading_config = TradingConfig(**trading_data)
+        research_config = ResearchConfig(**research_data)
+        system_config = SystemConfig(**system_data)
+        virtual_config = VirtualTradingConfig(**virtual_data)
+        real_config = RealTradingConfig(**real_data)
+        notification_config = NotificationConfig(**notification_data)
+        learning_config = LearningConfig(**learning_data)
+
+        config = cls(
+            trading=trading_config,
+            research=research_config,
+            system=system_config,
+            virtual_trading=virtual_config,
+            real_trading=real_config,
+            notifications=notification_config,
+            learning=learning_config,
+        )
+
+        _write_config_cache(config, cache_path)
+        return config
 
     def save(self, config_path: str = "config.yaml"):
         """Save configuration to YAML file"""
         data = {
-            "trading": {
-                "mode": self.trading.mode,
-                "account_balance": self.trading.account_balance,
-                "risk_percentage": self.trading.risk_percentage,
-                "max_position_size": self.trading.max_position_size,
-                "stop_loss_percentage": self.trading.stop_loss_percentage,
-                "take_profit_percentage": self.trading.take_profit_percentage,
-                "alpaca_api_key": self.trading.alpaca_api_key,
-                "alpaca_secret_key": self.trading.alpaca_secret_key,
-                "alpaca_paper_trading": self.trading.alpaca_paper_trading,
-            },
-            "research": {
-                "news_sources": self.research.news_sources,
-                "sentiment_threshold": self.research.sentiment_threshold,
-                "trend_analysis_window": self.research.trend_analysis_window,
-                "max_research_time": self.research.max_research_time,
-                "research_start_time": self.research.research_start_time,
-                "trading_start_time": self.research.trading_start_time,
-            },
-            "system": {
-                "database_url": self.system.database_url,
-                "log_level": self.system.log_level,
-                "dashboard_host": self.system.dashboard_host,
-                "dashboard_port": self.system.dashboard_port,
-                "max_daily_trades": self.system.max_daily_trades,
-                "max_daily_loss": self.system.max_daily_loss,
-                "emergency_stop_loss": self.system.emergency_stop_loss,
-            },
-            "virtual_trading": {
-                "simulate_slippage": self.virtual_trading.simulate_slippage,
-                "simulate_commissions": self.virtual_trading.simulate_commissions,
-                "commission_rate": self.virtual_trading.commission_rate,
-                "allow_short_selling": self.virtual_trading.allow_short_selling,
-                "margin_trading": self.virtual_trading.margin_trading,
-            },
-            "real_trading": {
-                "broker": self.real_trading.broker,
-                "require_confirmation": self.real_trading.require_confirmation,
-                "max_trade_size": self.real_trading.max_trade_size,
-                "daily_loss_limit": self.real_trading.daily_loss_limit,
-                "market_open": self.real_trading.market_open,
-                "market_close": self.real_trading.market_close,
-                "pre_market_start": self.real_trading.pre_market_start,
-                "after_hours_end": self.real_trading.after_hours_end,
-            },
-            "notifications": {
-                "email_enabled": self.notifications.email_enabled,
-                "email_address": self.notifications.email_address,
-                "email_password": self.notifications.email_password,
-                "webhook_url": self.notifications.webhook_url,
-                "notify_on_trade": self.notifications.notify_on_trade,
-                "notify_on_loss": self.notifications.notify_on_loss,
-                "notify_on_profit": self.notifications.notify_on_profit,
-                "notify_on_daily_summary": self.notifications.notify_on_daily_summary,
-            },
-            "learning": {
-                "track_performance": self.learning.track_performance,
-                "performance_window": self.learning.performance_window,
-                "adapt_strategies": self.learning.adapt_strategies,
-                "adaptation_threshold": self.learning.adaptation_threshold,
-                "enable_backtesting": self.learning.enable_backtesting,
-                "backtest_days": self.learning.backtest_days,
-            },
+            section: {name: getattr(getattr(self, section), name) for name in names}
+            for section, names in self._SCHEMA.items()
         }
 
         with open(config_path, "w") as f:
-            yaml.dump(data, f, default_flow_style=False, indent=2)
+            yaml.dump(data, f, Dumper=SafeDumper, default_flow_style=False, indent=2)
+
+
+@dataclass(slots=True, frozen=True)
+class StrategyLimits:
+    """Per-strategy overrides from the `strategies:` section, resolved once"""
+
+    account_balance: float = 10000.0
+    risk_percentage: float = 2.0
+    max_position_size: float = 5.0
+    max_daily_trades: int = 10
+    max_daily_loss: float = 5.0
+    stop_loss_percentage: float = 3.0
+    take_profit_percentage: float = 6.0
+    min_score_threshold: float = 0.1
+    max_risk_score: float = 0.8
+    name: str = ""
+    description: str = ""
+
+    # Config section each field lives in; everything else is under trading
+    _SYSTEM_FIELDS = ("max_daily_trades", "max_daily_loss")
+
+    @classmethod
+    def resolve(
+        cls, strategy_name: str, strategy_config: dict, base: Config
+    ) -> "StrategyLimits":
+        """Overlay a strategy's settings on the values inherited from base"""
+        values = {
+            f.name: getattr(cls._section(base, f.name), f.name) for f in fields(cls)
+        }
+        values["name"] = strategy_name
+        values["description"] = ""
+        values.update(
+            (key, value)
+            for key, value in strategy_config.items()
+            if key in cls.__dataclass_fields__
+        )
+        return cls(**values)
+
+    def apply(self, config: Config):
+        """Write these limits into a (per-strategy) Config"""
+        for f in fields(self):
+            setattr(self._section(config, f.name), f.name, getattr(self, f.name))
+
+    @classmethod
+    def _section(cls, config: Config, name: str):
+        return config.system if name in cls._SYSTEM_FIELDS else config.trading
+
+
+def load_yaml(path: str) -> dict:
+    """Parse a YAML file with the fastest available safe loader"""
+    with open(path, "r") as f:
+        return yaml.load(f, Loader=SafeLoader)
+
+
+@functools.lru_cache(maxsize=8)
+def _load_config_cached(config_path: str, mtime: float) -> Config:
+    """Process-level memo; a new mtime produces a new key and a fresh parse"""
+    return Config._parse_file(config_path)
+
+
+def _read_config_cache(config_path: str, cache_path: str) -> Optional[Config]:
+    """Return the pickled config if the sidecar is not older than the YAML file"""
+    try:
+        if os.stat(cache_path).st_mtime < os.stat(config_path).st_mtime:
+            return None
+        with open(cache_path, "rb") as f:
+            schema, config = pickle.load(f)
+        # A sidecar pickled before a field was added would lack that field
+        if schema != Config._SCHEMA or not isinstance(config, Config):
+            return None
+        return config
+    except Exception:
+        # Missing or unreadable cache - fall back to parsing the YAML
+        return None
+
+
+def _write_config_cache(config: Config, cache_path: str):
+    """Pickle the parsed config next to the YAML file (best effort)"""
+    tmp_path = f"{cache_path}.tmp"
+    try:
+        with open(tmp_path, "wb") as f:
+            pickle.dump((Config._SCHEMA, config), f, protocol=5)
+        os.replace(tmp_path, cache_path)
+    except Exception:
+        # A read-only filesystem just means we parse the YAML next time
+        pass
@@ -0,0 +1,27 @@
+"""
+Shared thread pool for blocking calls (yfinance, SQLite) made from async code
+"""
+
+import asyncio
+import contextvars
+import os
+from concurrent.futures import Future, ThreadPoolExecutor
+
+# One bounded pool for the whole process, so many strategies x many positions
+# can't fan out into hundreds of threads the way the default executor can
+_EXECUTOR = ThreadPoolExecutor(
+    max_workers=int(os.getenv("STOCK_SYNC_WORKERS", "16")),
+    thread_name_prefix="blocking",
+)
+
+
+def submit_blocking(fn, *args, **kwargs) -> Future:
+    """Schedule fn(*args, **kwargs) on the shared pool; usable from any thread"""
+    # Carry contextvars into the worker, as asyncio.to_thread does
+    ctx = contextvars.copy_context()
+    return _EXECUTOR.submit(ctx.run, fn, *args, **kwargs)
+
+
+async def run_blocking(fn, *args, **kwargs):
+    """Run fn(*args, **kwargs) on the shared pool and await its result"""
+    return await asyncio.wrap_future(submit_blocking(fn, *args, **kwargs))
@@ -0,0 +1,29 @@
+"""
+Price Bars Model
+"""
+
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+
+@dataclass(slots=True, frozen=True)
+class Bars:
+    """Recent daily closes and volumes for one symbol, plus its market cap"""
+
+    close: np.ndarray
+    volume: np.ndarray
+    market_cap: float
+
+    @classmethod
+    def from_history(cls, history: pd.DataFrame, market_cap: float) -> "Bars":
+        """Pull the columns research needs out of a yfinance history frame"""
+        return cls(
+            close=history["Close"].to_numpy(dtype=float),
+            volume=history["Volume"].to_numpy(dtype=float),
+            market_cap=float(market_cap),
+        )
+
+    def __len__(self) -> int:
+        return self.close.shape[0]
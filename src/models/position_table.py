@@ -0,0 +1,125 @@
+"""
+Position Table Model
+"""
+
+from typing import Any, Dict, Iterator, List, Sequence
+
+import numpy as np
+
+
+class PositionTable:
+    """Open positions stored column-wise, one NumPy array per field"""
+
+    _FLOAT_COLUMNS = (
+        "avg_price",
+        "current_price",
+        "total_value",
+        "pnl",
+        "score",
+        "risk_score",
+    )
+
+    def __init__(self, capacity: int = 16):
+        self.symbols: List[str] = []
+        self.index: Dict[str, int] = {}
+        self.shares = np.zeros(capacity, dtype=np.int64)
+        for name in self._FLOAT_COLUMNS:
+            setattr(self, name, np.zeros(capacity, dtype=np.float64))
+
+    def __len__(self) -> int:
+        return len(self.symbols)
+
+    def __contains__(self, symbol: str) -> bool:
+        return symbol in self.index
+
+    def __iter__(self) -> Iterator[str]:
+        # Iterate over a snapshot so callers can close positions while looping
+        return iter(list(self.symbols))
+
+    def _columns(self):
+        yield self.shares
+        for name in self._FLOAT_COLUMNS:
+            yield getattr(self, name)
+
+    def _grow(self):
+        """Double the capacity of every column"""
+        capacity = max(2 * len(self.shares), 1)
+        self.shares = np.resize(self.shares, capacity)
+        for name in self._FLOAT_COLUMNS:
+            setattr(self, name, np.resize(getattr(self, name), capacity))
+
+    def add(
+        self, symbol: str, shares: int, price: float, score: float, risk_score: float
+    ):
+        """Open a position at price, replacing any existing one in symbol"""
+        i = self.index.get(symbol)
+        if i is None:
+            i = len(self.symbols)
+            if i == len(self.shares):
+                self._grow()
+            self.symbols.append(symbol)
+            self.index[symbol] = i
+
+        self.shares[i] = shares
+        self.avg_price[i] = price
+        self.current_price[i] = price
+        self.total_value[i] = shares * price
+        self.pnl[i] = 0.0
+        self.score[i] = np.nan if score is None else score
+        self.risk_score[i] = np.nan if risk_score is None else risk_score
+
+    def remove(self, symbol: str):
+        """Drop a position by moving the last row into its slot"""
+        i = self.index.pop(symbol)
+        last = len(self.symbols) - 1
+        if i != last:
+            moved = self.symbols[last]
+            self.symbols[i] = moved
+            self.index[moved] = i
+            for column in self._columns():
+                column[i] = column[last]
+        self.symbols.pop()
+
+    def clear(self):
+        """Drop every position"""
+        self.symbols.clear()
+        self.index.clear()
+
+    def row(self, symbol: str) -> Dict[str, Any]:
+        """Snapshot of one position as a plain dict (raises KeyError if absent)"""
+        i = self.index[symbol]
+        row = {"shares": int(self.shares[i])}
+        for name in self._FLOAT_COLUMNS:
+            row[name] = float(getattr(self, name)[i])
+        return row
+
+    def update_prices(self, symbols: Sequence[str], prices: Sequence[float]) -> list:
+        """Mark held symbols to market in one vectorized pass.
+
+        Returns (current_price, total_value, pnl, symbol) rows for the
+        positions table, in the order of symbols.
+        """
+        idx = np.fromiter((self.index[s] for s in symbols), np.intp, len(symbols))
+        price = np.asarray(prices, dtype=np.float64)
+        shares = self.shares[idx]
+
+        self.current_price[idx] = price
+        self.total_value[idx] = shares * price
+        self.pnl[idx] = shares * (price - self.avg_price[idx])
+
+        return list(
+            zip(
+                price.tolist(),
+                self.total_value[idx].tolist(),
+                self.pnl[idx].tolist(),
+                symbols,
+            )
+        )
+
+    def total_value_sum(self) -> float:
+        """Market value of all open positions"""
+        return float(self.total_value[: len(self.symbols)].sum())
+
+    def pnl_sum(self) -> float:
+        """Unrealized P&L across all open positions"""
+        return float(self.pnl[: len(self.symbols)].sum())
@@ -2,12 +2,12 @@
 Trading Opportunity Model
 """
 
-from dataclasses import dataclass
+from dataclasses import dataclass, asdict, field, replace
 from datetime import datetime
 from typing import Optional
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class TradingOpportunity:
     """Represents a trading opportunity"""
 
@@ -26,30 +26,36 @@ class TradingOpportunity:
     potential_return: Optional[float] = None
     score: Optional[float] = None
 
+    # Cached ISO-8601 form of timestamp, filled in by __post_init__
+    _timestamp_iso: str = field(init=False, repr=False, compare=False)
+
     def __post_init__(self):
         """Initialize calculated fields"""
+        # Frozen dataclass: defaults have to bypass the generated __setattr__
         if self.risk_score is None:
-            self.risk_score = 0.5  # Default risk score
+            object.__setattr__(self, "risk_score", 0.5)  # Default risk score
 
         if self.potential_return is None:
-            self.potential_return = 0.0  # Default potential return
+            object.__setattr__(self, "potential_return", 0.0)  # Default return
 
         if self.score is None:
-            self.score = 0.0  # Default score
+            object.__setattr__(self, "score", 0.0)  # Default score
+
+        object.__setattr__(self, "_timestamp_iso", self.timestamp.isoformat())
+
+    def with_scores(
+        self, risk_score: float, potential_return: float, score: float
+    ) -> "TradingOpportunity":
+        """Return a copy of this opportunity with the calculated fields set"""
+        return replace(
+            self,
+            risk_score=risk_score,
+            potential_return=potential_return,
+            score=score,
+        )
 
     def to_dict(self) -> dict:
         """Convert to dictionary for JSON serialization"""
-        return {
-            "symbol": self.symbol,
-            "current_price": self.current_price,
-            "volume_ratio": self.volume_ratio,
-            "volatility": self.volatility,
-            "technical_score": self.technical_score,
-            "sentiment_score": self.sentiment_score,
-            "news_score": self.news_score,
-            "market_cap": self.market_cap,
-            "timestamp": self.timestamp.isoformat(),
-            "risk_score": self.risk_score,
-            "potential_return": self.potential_return,
-            "score": self.score,
-        }
+        data = asdict(self)
+        data["timestamp"] = data.pop("_timestamp_iso")
+        return data
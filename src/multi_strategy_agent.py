@@ -5,17 +5,19 @@ Multi-Strategy Trading Agent - Runs multiple trading strategies simultaneously
 import asyncio
 import logging
 from datetime import datetime, timedelta
-from typing import List, Dict, Any
-import yaml
+from typing import List, Dict, Any, Optional
 import sqlite3
 import os
 import copy
+import time
 
 from .research_engine import ResearchEngine
 from .trading_engine import TradingEngine
 from .portfolio_manager import PortfolioManager
 from .models.trading_opportunity import TradingOpportunity
-from .config import Config
+from .scoring import rank_opportunities
+from .config import Config, StrategyLimits, load_yaml
+from .waits import wait_for_event, wait_until
 
 logger = logging.getLogger(__name__)
 
@@ -27,6 +29,10 @@ class MultiStrategyAgent:
         self.config = config
         self.strategies = {}
         self.is_running = False
+        self._shutdown_event = asyncio.Event()  # Set by shutdown() to end waits
+
+        # Research is shared by every strategy, so one engine serves them all
+        self.research_engine = ResearchEngine(config.research)
 
         # Initialize main database
         self.init_main_database()
@@ -87,6 +93,22 @@ class MultiStrategyAgent:
             """
             )
 
+            # The dashboard reads each strategy's latest trades; index that seek
+            cursor.execute(
+                """
+                CREATE INDEX IF NOT EXISTS idx_trades_strategy_ts
+                ON trades(strategy, timestamp DESC)
+            """
+            )
+
+            # ...and each strategy's open positions by value
+            cursor.execute(
+                """
+                CREATE INDEX IF NOT EXISTS idx_positions_strategy_value
+                ON positions(strategy, total_value DESC) WHERE shares > 0
+            """
+            )
+
             # Create portfolio_summary table for main database
             cursor.execute(
                 """
@@ -117,8 +139,7 @@ class MultiStrategyAgent:
             logger.info(f"Current working directory: {os.getcwd()}")
             logger.info(f"Config file exists: {os.path.exists('config.yaml')}")
 
-            with open("config.yaml", "r") as f:
-                config_data = yaml.safe_load(f)
+            config_data = load_yaml("config.yaml")
 
             logger.info(f"📋 Config data keys: {list(config_data.keys())}")
             self.strategy_configs = config_data.get("strategies", {})
@@ -137,13 +158,13 @@ class MultiStrategyAgent:
         self.strategies_failed = False
         for strategy_name, strategy_config in self.strategy_configs.items():
             try:
-                # Create strategy-specific config
-                strategy_config_obj = self.create_strategy_config(
-                    strategy_name, strategy_config
+                # Resolve strategy overrides once, then build its config from them
+                limits = StrategyLimits.resolve(
+                    strategy_name, strategy_config, self.config
                 )
+                strategy_config_obj = self.create_strategy_config(strategy_name, limits)
 
                 # Initialize components for this strategy
-                research_engine = ResearchEngine(strategy_config_obj.research)
                 trading_engine = TradingEngine(strategy_config_obj.trading)
                 portfolio_manager = PortfolioManager(
                     strategy_config_obj.trading, strategy_name
@@ -152,11 +173,14 @@ class MultiStrategyAgent:
                 # Store strategy components
                 self.strategies[strategy_name] = {
                     "config": strategy_config_obj,
-                    "research_engine": research_engine,
+                    "limits": limits,
                     "trading_engine": trading_engine,
                     "portfolio_manager": portfolio_manager,
                     "daily_opportunities": [],
                     "is_active": True,
+                    "static_meta": self.strategy_meta(
+                        strategy_name, strategy_config_obj
+                    ),
                 }
 
                 logger.info(f"✅ Initialized {strategy_name} strategy")
@@ -170,65 +194,29 @@ class MultiStrategyAgent:
             )
             self.strategies_failed = True
 
+    def strategy_meta(self, strategy_name: str, config: Config) -> Dict[str, Any]:
+        """Descriptive and limit fields for a strategy; fixed once it is built"""
+        return {
+            "name": getattr(config.trading, "name", strategy_name),
+            "description": getattr(config.trading, "description", ""),
+            "risk_percentage": config.trading.risk_percentage,
+            "max_position_size": config.trading.max_position_size,
+            "max_daily_trades": config.system.max_daily_trades,
+            "max_daily_loss": config.system.max_daily_loss,
+        }
+
     def create_strategy_config(
-        self, strategy_name: str, strategy_config: dict
+        self, strategy_name: str, limits: StrategyLimits
     ) -> Config:
         """Create a Config object for a specific strategy by inheriting from main config"""
         try:
-            # Start with a deep copy of the main config
-            strategy_config_obj = copy.deepcopy(self.config)
-
-            # Apply strategy-specific overrides
-            if "account_balance" in strategy_config:
-                strategy_config_obj.trading.account_balance = strategy_config[
-                    "account_balance"
-                ]
-
-            if "risk_percentage" in strategy_config:
-                strategy_config_obj.trading.risk_percentage = strategy_config[
-                    "risk_percentage"
-                ]
-
-            if "max_position_size" in strategy_config:
-                strategy_config_obj.trading.max_position_size = strategy_config[
-                    "max_position_size"
-                ]
-
-            if "max_daily_trades" in strategy_config:
-                strategy_config_obj.system.max_daily_trades = strategy_config[
-                    "max_daily_trades"
-                ]
-
-            if "max_daily_loss" in strategy_config:
-                strategy_config_obj.system.max_daily_loss = strategy_config[
-                    "max_daily_loss"
-                ]
-
-            if "stop_loss_percentage" in strategy_config:
-                strategy_config_obj.trading.stop_loss_percentage = strategy_config[
-                    "stop_loss_percentage"
-                ]
-
-            if "take_profit_percentage" in strategy_config:
-                strategy_config_obj.trading.take_profit_percentage = strategy_config[
-                    "take_profit_percentage"
-                ]
-
-            # Store strategy-specific thresholds as custom attributes
-            strategy_config_obj.trading.min_score_threshold = strategy_config.get(
-                "min_score_threshold", 0.1
-            )
-            strategy_config_obj.trading.max_risk_score = strategy_config.get(
-                "max_risk_score", 0.8
-            )
+            # Strategies only override trading/system; share the other sections
+            strategy_config_obj = copy.copy(self.config)
+            strategy_config_obj.trading = copy.copy(self.config.trading)
+            strategy_config_obj.system = copy.copy(self.config.system)
 
-            # Store strategy name and description
-            strategy_config_obj.trading.name = strategy_config.get(
-                "name", strategy_name
-            )
-            strategy_config_obj.trading.description = strategy_config.get(
-                "description", ""
-            )
+            # Apply strategy-specific overrides, thresholds, name and description
+            limits.apply(strategy_config_obj)
 
             logger.info(f"✅ Created config for {strategy_name} strategy")
             return strategy_config_obj
@@ -241,6 +229,7 @@ class MultiStrategyAgent:
     async def run(self):
         """Main trading loop for all strategies"""
         self.is_running = True
+        self._shutdown_event.clear()
         logger.info(f"🚀 Starting multi-strategy trading agent")
 
         while self.is_running:
@@ -253,7 +242,7 @@ class MultiStrategyAgent:
 
             except Exception as e:
                 logger.error(f"❌ Error in multi-strategy trading cycle: {e}")
-                await asyncio.sleep(60)  # Wait before retrying
+                await wait_for_event(self._shutdown_event, 60)  # Wait before retrying
 
     async def daily_trading_cycle(self):
         """Execute daily trading cycle for all strategies"""
@@ -284,17 +273,7 @@ class MultiStrategyAgent:
             logger.warning("⚠️ No strategies loaded, skipping research")
             return []
 
-        # Use the first strategy's research engine for shared research
-        strategy_names = list(self.strategies.keys())
-        if not strategy_names:
-            logger.warning("⚠️ No strategy names available, skipping research")
-            return []
-
-        first_strategy_name = strategy_names[0]
-        first_strategy = self.strategies[first_strategy_name]
-        research_engine = first_strategy["research_engine"]
-
-        opportunities = await research_engine.find_opportunities()
+        opportunities = await self.research_engine.find_opportunities()
         logger.info(
             f"🔍 Researched {len(opportunities)} opportunities for all strategies"
         )
@@ -322,20 +301,23 @@ class MultiStrategyAgent:
 
         # Execute trades
         trades_executed = 0
-        max_trades = config.system.max_daily_trades
+        max_trades = strategy_data["limits"].max_daily_trades
+        slippages = trading_engine.draw_slippages(max_trades)
 
-        for opportunity in ranked_opportunities[:max_trades]:
+        candidates = ranked_opportunities[:max_trades]
+        position_sizes = trading_engine.batch_position_sizes(candidates)
+
+        for opportunity, position_size in zip(candidates, position_sizes):
             try:
                 # Check if we should take this position for this strategy
-                if await self.should_take_position(opportunity, strategy_name):
+                if self.should_take_position(opportunity, strategy_name, position_size):
                     # Execute the trade
-                    await trading_engine.execute_trade(opportunity)
+                    await trading_engine.execute_trade(
+                        opportunity, slippages[trades_executed], position_size
+                    )
 
                     # Add to portfolio
-                    shares = int(
-                        trading_engine.calculate_position_size(opportunity)
-                        / opportunity.current_price
-                    )
+                    shares = int(position_size / opportunity.current_price)
                     await portfolio_manager.add_position(
                         opportunity.symbol,
                         shares,
@@ -374,94 +356,64 @@ class MultiStrategyAgent:
         """Analyze and rank trading opportunities for a specific strategy"""
         logger.info(f"📊 Analyzing {len(opportunities)} opportunities")
 
-        for opportunity in opportunities:
-            # Calculate risk-adjusted return
-            risk_score = self.calculate_risk_score(opportunity)
-            potential_return = self.calculate_potential_return(opportunity)
-
-            opportunity.risk_score = risk_score
-            opportunity.potential_return = potential_return
-            opportunity.score = potential_return / (
-                risk_score + 0.1
-            )  # Avoid division by zero
-
-        # Sort by score (highest first)
-        ranked = sorted(opportunities, key=lambda x: x.score, reverse=True)
+        # Only the first max_daily_trades are ever traded, so partial-sort to those
+        ranked = rank_opportunities(opportunities, top_k=config.system.max_daily_trades)
 
         logger.info(f"🏆 Top opportunities: {[o.symbol for o in ranked[:3]]}")
         return ranked
 
-    def calculate_risk_score(self, opportunity: TradingOpportunity) -> float:
-        """Calculate risk score based on volatility, volume, and other factors"""
-        volatility = opportunity.volatility or 0.2
-        volume_ratio = opportunity.volume_ratio or 1.0
-        market_cap = opportunity.market_cap or 1000000000
-
-        risk_score = volatility * (1 / volume_ratio) * (1000000000 / market_cap)
-        return min(risk_score, 1.0)  # Cap at 1.0
-
-    def calculate_potential_return(self, opportunity: TradingOpportunity) -> float:
-        """Calculate potential return based on technical indicators and sentiment"""
-        sentiment_score = opportunity.sentiment_score or 0.0
-        technical_score = opportunity.technical_score or 0.0
-        news_score = opportunity.news_score or 0.0
-
-        # Weighted average of different factors
-        potential_return = (
-            sentiment_score * 0.3 + technical_score * 0.4 + news_score * 0.3
-        )
-
-        return max(potential_return, 0.0)
-
-    async def should_take_position(
-        self, opportunity: TradingOpportunity, strategy_name: str
+    def should_take_position(
+        self,
+        opportunity: TradingOpportunity,
+        strategy_name: str,
+        position_size: Optional[float] = None,
     ) -> bool:
         """Determine if we should take a position based on strategy-specific risk management"""
         strategy_data = self.strategies[strategy_name]
-        config = strategy_data["config"]
+        limits = strategy_data["limits"]
         portfolio_manager = strategy_data["portfolio_manager"]
 
-        # Check if we have enough capital
-        available_capital = portfolio_manager.get_available_capital()
-        position_size = strategy_data["trading_engine"].calculate_position_size(
-            opportunity
-        )
+        # Cheapest checks first; only the capital check has to size the position
 
-        if position_size > available_capital:
+        # Check minimum score threshold (strategy-specific)
+        if opportunity.score < limits.min_score_threshold:
             logger.info(
-                f"💰 Insufficient capital for {strategy_name} - {opportunity.symbol}"
+                f"📉 Score too low for {strategy_name} - {opportunity.symbol}: {opportunity.score:.3f}"
             )
             return False
 
-        # Check if we already have a position in this stock
-        if portfolio_manager.has_position(opportunity.symbol):
+        # Check risk limits (strategy-specific)
+        if opportunity.risk_score > limits.max_risk_score:
             logger.info(
-                f"📈 Already have position in {strategy_name} - {opportunity.symbol}"
+                f"⚠️  Risk too high for {strategy_name} - {opportunity.symbol}: {opportunity.risk_score:.3f}"
             )
             return False
 
-        # Check risk limits (strategy-specific)
-        max_risk_score = config.trading.max_risk_score
-        if opportunity.risk_score > max_risk_score:
+        # Check if we already have a position in this stock
+        if portfolio_manager.has_position(opportunity.symbol):
             logger.info(
-                f"⚠️  Risk too high for {strategy_name} - {opportunity.symbol}: {opportunity.risk_score:.3f}"
+                f"📈 Already have position in {strategy_name} - {opportunity.symbol}"
             )
             return False
 
         # Check daily loss limit (strategy-specific)
-        portfolio_summary = portfolio_manager.get_portfolio_summary()
-        max_daily_loss = config.system.max_daily_loss
-        if portfolio_summary["daily_pnl"] < -max_daily_loss:
+        daily_pnl = portfolio_manager.daily_pnl
+        if daily_pnl < -limits.max_daily_loss:
             logger.info(
-                f"🛑 Daily loss limit reached for {strategy_name}: ${portfolio_summary['daily_pnl']:.2f}"
+                f"🛑 Daily loss limit reached for {strategy_name}: ${daily_pnl:.2f}"
             )
             return False
 
-        # Check minimum score threshold (strategy-specific)
-        min_score_threshold = config.trading.min_score_threshold
-        if opportunity.score < min_score_threshold:
+        # Check if we have enough capital
+        available_capital = portfolio_manager.get_available_capital()
+        if position_size is None:
+            position_size = strategy_data["trading_engine"].calculate_position_size(
+                opportunity
+            )
+
+        if position_size > available_capital:
             logger.info(
-                f"📉 Score too low for {strategy_name} - {opportunity.symbol}: {opportunity.score:.3f}"
+                f"💰 Insufficient capital for {strategy_name} - {opportunity.symbol}"
             )
             return False
 
@@ -469,12 +421,14 @@ class MultiStrategyAgent:
 
     async def wait_for_next_trading_day(self):
         """Wait until the next trading day"""
-        now = datetime.now()
-        next_trading_day = self.get_next_trading_day(now)
-        wait_time = (next_trading_day - now).total_seconds()
+        next_trading_day = self.get_next_trading_day(datetime.now())
+
+        # Fix the deadline once; the wait re-checks it rather than recomputing
+        deadline = next_trading_day.timestamp()
+        wait_time = deadline - time.time()
 
         logger.info(f"⏰ Waiting {wait_time/3600:.1f} hours until next trading day")
-        await asyncio.sleep(wait_time)
+        await wait_until(self._shutdown_event, deadline)
 
     def get_next_trading_day(self, current_time: datetime) -> datetime:
         """Get the next trading day"""
@@ -505,6 +459,7 @@ class MultiStrategyAgent:
     async def shutdown(self):
         """Shutdown the multi-strategy agent"""
         self.is_running = False
+        self._shutdown_event.set()
 
         for strategy_name, strategy_data in self.strategies.items():
             try:
@@ -4,14 +4,85 @@ Portfolio Manager - Tracks positions, P&L, and portfolio performance
 
 import asyncio
 import logging
+from concurrent.futures import Future
+from contextlib import contextmanager
 from datetime import datetime, timedelta
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional, Tuple
 import sqlite3
 import os
-import yfinance as yf
+import threading
+
+from .executor import run_blocking, submit_blocking
+from .prices import cache_prices, cached_price, get_current_price
+from .models.position_table import PositionTable
 
 logger = logging.getLogger(__name__)
 
+MAIN_DB_FILE = "trading_data.db"
+
+# Concurrent yfinance lookups per batch; higher values trip Yahoo rate limits
+_PRICE_FETCH_CONCURRENCY = 8
+
+# Most queued writes the background writer commits in one go
+_WRITE_BATCH_SIZE = 64
+
+# Statement text is kept constant so sqlite3's per-connection statement cache
+# hits on every call; the main database variants carry the extra strategy column
+_INSERT_TRADE_SQL = """
+    INSERT INTO trades (symbol, shares, price, total, type, opportunity_score, risk_score)
+    VALUES (?, ?, ?, ?, ?, ?, ?)
+"""
+_INSERT_MAIN_TRADE_SQL = """
+    INSERT INTO trades (symbol, shares, price, total, type, strategy, opportunity_score, risk_score)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+"""
+_UPSERT_POSITION_SQL = """
+    INSERT OR REPLACE INTO positions (symbol, shares, avg_price, current_price, total_value, pnl)
+    VALUES (?, ?, ?, ?, ?, ?)
+"""
+_UPSERT_MAIN_POSITION_SQL = """
+    INSERT OR REPLACE INTO positions (symbol, strategy, shares, avg_price, current_price, total_value, pnl)
+    VALUES (?, ?, ?, ?, ?, ?, ?)
+"""
+_UPDATE_POSITION_PRICE_SQL = """
+    UPDATE positions
+    SET current_price = ?, total_value = ?, pnl = ?, last_updated = CURRENT_TIMESTAMP
+    WHERE symbol = ?
+"""
+_UPDATE_MAIN_POSITION_PRICE_SQL = """
+    UPDATE positions
+    SET current_price = ?, total_value = ?, pnl = ?, last_updated = CURRENT_TIMESTAMP
+    WHERE symbol = ? AND strategy = ?
+"""
+_DELETE_POSITION_SQL = "DELETE FROM positions WHERE symbol = ?"
+_DELETE_MAIN_POSITION_SQL = "DELETE FROM positions WHERE symbol = ? AND strategy = ?"
+_INSERT_SUMMARY_SQL = """
+    INSERT INTO portfolio_summary (account_balance, total_pnl, daily_pnl, positions_count, trades_today)
+    VALUES (?, ?, ?, ?, ?)
+"""
+
+
+def _connect(db_file: str) -> sqlite3.Connection:
+    """Open a long-lived autocommit connection tuned for frequent small writes"""
+    conn = sqlite3.connect(db_file, check_same_thread=False, isolation_level=None)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA busy_timeout=5000")
+    conn.execute("PRAGMA temp_store=MEMORY")
+    return conn
+
+
+@contextmanager
+def _transaction(conn: sqlite3.Connection):
+    """Group several statements into one commit on an autocommit connection"""
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        yield conn
+    except BaseException:
+        conn.execute("ROLLBACK")
+        raise
+    conn.execute("COMMIT")
+
 
 class PortfolioManager:
     """Manages portfolio positions, P&L, and performance tracking"""
@@ -20,23 +91,38 @@ class PortfolioManager:
         self.config = config
         self.strategy_name = strategy_name
         self.account_balance = config.account_balance
-        self.positions: Dict[str, Dict[str, Any]] = {}
+        self.positions = PositionTable()
         self.total_pnl = 0.0
         self.daily_pnl = 0.0
         self.trades_today = 0
         self.last_reset_date = datetime.now().date()
-
-        # Strategy-specific database
+        # Bumped whenever a field in get_portfolio_summary() may have changed,
+        # so readers can reuse what they built from the last summary
+        self.version = 0
+
+        # Strategy-specific database, plus the shared main database. Writes are
+        # queued and committed in batches by a background task (see _writer_loop);
+        # the lock keeps worker-thread transactions from interleaving
+        self._db_lock = threading.Lock()
+        self._write_q: Optional[asyncio.Queue] = None
+        self._writer_task: Optional[asyncio.Task] = None
+        self._write_inflight: Optional[Future] = None  # Batch being committed
         self.db_file = f"trading_data_{strategy_name}.db"
+        self._conn = _connect(self.db_file)
+        try:
+            self._main_conn = _connect(MAIN_DB_FILE)
+        except Exception as e:
+            logger.warning(f"⚠️  Could not open main database: {e}")
+            self._main_conn = None
         self.init_database()
+        self._sync_main_positions()
 
         logger.info(f"💰 Portfolio Manager initialized for {strategy_name}")
 
     def init_database(self):
         """Initialize SQLite database for portfolio tracking"""
         try:
-            conn = sqlite3.connect(self.db_file)
-            cursor = conn.cursor()
+            cursor = self._conn.cursor()
 
             # Create trades table
             cursor.execute(
@@ -85,13 +171,46 @@ class PortfolioManager:
             """
             )
 
-            conn.commit()
-            conn.close()
             logger.info(f"📊 Database initialized: {self.db_file}")
 
         except Exception as e:
             logger.error(f"❌ Error initializing database: {e}")
 
+    def _sync_main_positions(self):
+        """Mirror this strategy's positions into the main database
+
+        The dashboard reads positions for every strategy from the main
+        database. Positions opened before it tracked price updates may be
+        stale there, so copy the strategy database's rows over once.
+        """
+        if self._main_conn is None:
+            return
+        try:
+            with self._db_lock:
+                conn = self._main_conn
+                conn.execute("ATTACH DATABASE ? AS strategy_db", (self.db_file,))
+                try:
+                    with _transaction(conn):
+                        conn.execute(
+                            "DELETE FROM main.positions WHERE strategy = ?",
+                            (self.strategy_name,),
+                        )
+                        conn.execute(
+                            """
+                            INSERT INTO main.positions
+                                (symbol, strategy, shares, avg_price, current_price,
+                                 total_value, pnl, last_updated)
+                            SELECT symbol, ?, shares, avg_price, current_price,
+                                   total_value, pnl, last_updated
+                            FROM strategy_db.positions
+                            """,
+                            (self.strategy_name,),
+                        )
+                finally:
+                    conn.execute("DETACH DATABASE strategy_db")
+        except Exception as e:
+            logger.warning(f"⚠️  Could not sync positions to main database: {e}")
+
     async def add_position(
         self, symbol: str, shares: int, price: float, score: float, risk_score: float
     ):
@@ -105,54 +224,24 @@ class PortfolioManager:
             total_value = shares * price
             self.account_balance -= total_value
 
-            # Store position
-            self.positions[symbol] = {
-                "shares": shares,
-                "avg_price": price,
-                "current_price": price,
-                "total_value": total_value,
-                "pnl": 0.0,
-                "score": score,
-                "risk_score": risk_score,
-            }
-
-            # Store in strategy-specific database
-            conn = sqlite3.connect(self.db_file)
-            cursor = conn.cursor()
-
-            # Insert trade record
-            cursor.execute(
-                """
-                INSERT INTO trades (symbol, shares, price, total, type, opportunity_score, risk_score)
-                VALUES (?, ?, ?, ?, ?, ?, ?)
-            """,
-                (symbol, shares, price, total_value, "BUY", score, risk_score),
-            )
+            # Store position (replacing any existing one in this symbol)
+            self.positions.add(symbol, shares, price, score, risk_score)
 
-            # Update positions table
-            cursor.execute(
-                """
-                INSERT OR REPLACE INTO positions (symbol, shares, avg_price, current_price, total_value, pnl)
-                VALUES (?, ?, ?, ?, ?, ?)
-            """,
-                (symbol, shares, price, price, total_value, 0.0),
+            # Queue the records; the background writer commits them
+            self._enqueue_write(
+                False,
+                _INSERT_TRADE_SQL,
+                [(symbol, shares, price, total_value, "BUY", score, risk_score)],
             )
-
-            conn.commit()
-            conn.close()
-
-            # Also store in main database
-            try:
-                main_db_path = "trading_data.db"
-                conn = sqlite3.connect(main_db_path)
-                cursor = conn.cursor()
-
-                # Insert trade record in main database
-                cursor.execute(
-                    """
-                    INSERT INTO trades (symbol, shares, price, total, type, strategy, opportunity_score, risk_score)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-                """,
+            self._enqueue_write(
+                False,
+                _UPSERT_POSITION_SQL,
+                [(symbol, shares, price, price, total_value, 0.0)],
+            )
+            self._enqueue_write(
+                True,
+                _INSERT_MAIN_TRADE_SQL,
+                [
                     (
                         symbol,
                         shares,
@@ -162,15 +251,13 @@ class PortfolioManager:
                         self.strategy_name,
                         score,
                         risk_score,
-                    ),
-                )
-
-                # Update positions table in main database
-                cursor.execute(
-                    """
-                    INSERT OR REPLACE INTO positions (symbol, strategy, shares, avg_price, current_price, total_value, pnl)
-                    VALUES (?, ?, ?, ?, ?, ?, ?)
-                """,
+                    )
+                ],
+            )
+            self._enqueue_write(
+                True,
+                _UPSERT_MAIN_POSITION_SQL,
+                [
                     (
                         symbol,
                         self.strategy_name,
@@ -179,15 +266,12 @@ class PortfolioManager:
                         price,
                         total_value,
                         0.0,
-                    ),
-                )
-
-                conn.commit()
-                conn.close()
-            except Exception as e:
-                logger.warning(f"⚠️  Could not store in main database: {e}")
+                    )
+                ],
+            )
 
             self.trades_today += 1
+            self.version += 1
             logger.info(
                 f"📈 Added position: {shares} shares of {symbol} at ${price:.2f}"
             )
@@ -202,128 +286,116 @@ class PortfolioManager:
             if symbol not in self.positions:
                 return
 
-            position = self.positions[symbol]
-            shares = position["shares"]
-            avg_price = position["avg_price"]
-
-            # Calculate new values
-            total_value = shares * current_price
-            pnl = total_value - (shares * avg_price)
-
-            # Update position
-            position["current_price"] = current_price
-            position["total_value"] = total_value
-            position["pnl"] = pnl
-
-            # Update database
-            conn = sqlite3.connect(self.db_file)
-            cursor = conn.cursor()
-
-            cursor.execute(
-                """
-                UPDATE positions 
-                SET current_price = ?, total_value = ?, pnl = ?, last_updated = CURRENT_TIMESTAMP
-                WHERE symbol = ?
-            """,
-                (current_price, total_value, pnl, symbol),
-            )
-
-            conn.commit()
-            conn.close()
+            # Update position and database
+            rows = self.positions.update_prices([symbol], [current_price])
+            self._enqueue_price_rows(rows)
 
         except Exception as e:
             logger.error(f"❌ Error updating position for {symbol}: {e}")
 
+    def _store_prices(self, prices: Dict[str, float]):
+        """Apply prices to all held positions and queue them as one batch"""
+        symbols = [symbol for symbol in prices if symbol in self.positions]
+        if symbols:
+            rows = self.positions.update_prices(
+                symbols, [prices[symbol] for symbol in symbols]
+            )
+            self._enqueue_price_rows(rows)
+
+    def _enqueue_price_rows(self, rows: List[tuple]):
+        """Queue marked-to-market position rows for both databases"""
+        if not rows:
+            return
+        self.version += 1  # total_positions_value moved with the prices
+        self._enqueue_write(False, _UPDATE_POSITION_PRICE_SQL, rows)
+        self._enqueue_write(
+            True,
+            _UPDATE_MAIN_POSITION_PRICE_SQL,
+            [row + (self.strategy_name,) for row in rows],
+        )
+
     async def review_positions(self):
         """Review and update all positions with current market prices"""
         logger.info("🔍 Reviewing portfolio positions")
 
-        for symbol in list(self.positions.keys()):
-            try:
-                # Get current market price
-                current_price = await self.get_current_price(symbol)
-                if current_price > 0:
-                    await self.update_position(symbol, current_price)
+        # Get current market prices
+        prices = await self._fetch_prices(list(self.positions))
 
-                    # Check stop loss and take profit
-                    await self.check_stop_loss_take_profit(symbol, current_price)
+        # All position updates ride a single commit
+        try:
+            self._store_prices(prices)
+        except Exception as e:
+            logger.error(f"❌ Error updating positions: {e}")
 
+        # Collect every stop-loss/take-profit exit, then write them in one batch
+        closes = []
+        for symbol, current_price in prices.items():
+            try:
+                reason = self._exit_reason(symbol, current_price)
+                if reason:
+                    closes.append((symbol, current_price, reason))
             except Exception as e:
                 logger.error(f"❌ Error reviewing position for {symbol}: {e}")
 
-    async def check_stop_loss_take_profit(self, symbol: str, current_price: float):
-        """Check if position should be closed due to stop loss or take profit"""
-        try:
-            position = self.positions[symbol]
-            avg_price = position["avg_price"]
-            shares = position["shares"]
+        if closes:
+            self._close_positions(closes)
 
-            # Calculate percentage change
-            price_change_pct = ((current_price - avg_price) / avg_price) * 100
+    def _exit_reason(self, symbol: str, current_price: float) -> Optional[str]:
+        """Return "Stop Loss" or "Take Profit" if the position should be closed"""
+        avg_price = self.positions.row(symbol)["avg_price"]
 
-            # Check stop loss
-            stop_loss_pct = -self.config.stop_loss_percentage
-            if price_change_pct <= stop_loss_pct:
-                await self.close_position(symbol, current_price, "Stop Loss")
-                return
+        # Calculate percentage change
+        price_change_pct = ((current_price - avg_price) / avg_price) * 100
 
-            # Check take profit
-            take_profit_pct = self.config.take_profit_percentage
-            if price_change_pct >= take_profit_pct:
-                await self.close_position(symbol, current_price, "Take Profit")
-                return
+        # Check stop loss
+        if price_change_pct <= -self.config.stop_loss_percentage:
+            return "Stop Loss"
+
+        # Check take profit
+        if price_change_pct >= self.config.take_profit_percentage:
+            return "Take Profit"
+
+        return None
+
+    async def check_stop_loss_take_profit(self, symbol: str, current_price: float):
+        """Check if position should be closed due to stop loss or take profit"""
+        try:
+            reason = self._exit_reason(symbol, current_price)
+            if reason:
+                await self.close_position(symbol, current_price, reason)
 
         except Exception as e:
             logger.error(f"❌ Error checking stop loss/take profit for {symbol}: {e}")
 
     async def close_position(self, symbol: str, current_price: float, reason: str):
         """Close a position"""
-        try:
-            position = self.positions[symbol]
-            shares = position["shares"]
-            avg_price = position["avg_price"]
+        self._close_positions([(symbol, current_price, reason)])
 
-            # Calculate P&L
-            total_value = shares * current_price
-            pnl = total_value - (shares * avg_price)
-
-            # Update account balance
-            self.account_balance += total_value
-            self.total_pnl += pnl
-            self.daily_pnl += pnl
-
-            # Remove position
-            del self.positions[symbol]
-
-            # Store trade record in strategy-specific database
-            conn = sqlite3.connect(self.db_file)
-            cursor = conn.cursor()
+    def _close_positions(self, closes: List[Tuple[str, float, str]]):
+        """Close (symbol, price, reason) positions and queue their records as a batch"""
+        trades, main_trades, closed = [], [], []
+        for symbol, current_price, reason in closes:
+            try:
+                position = self.positions.row(symbol)
+                shares = position["shares"]
+                avg_price = position["avg_price"]
 
-            cursor.execute(
-                """
-                INSERT INTO trades (symbol, shares, price, total, type)
-                VALUES (?, ?, ?, ?, ?)
-            """,
-                (symbol, shares, current_price, total_value, "SELL"),
-            )
+                # Calculate P&L
+                total_value = shares * current_price
+                pnl = total_value - (shares * avg_price)
 
-            # Remove from positions table
-            cursor.execute("DELETE FROM positions WHERE symbol = ?", (symbol,))
+                # Update account balance
+                self.account_balance += total_value
+                self.total_pnl += pnl
+                self.daily_pnl += pnl
 
-            conn.commit()
-            conn.close()
+                # Remove position
+                self.positions.remove(symbol)
 
-            # Also store in main database
-            try:
-                main_db_path = "trading_data.db"
-                conn = sqlite3.connect(main_db_path)
-                cursor = conn.cursor()
-
-                cursor.execute(
-                    """
-                    INSERT INTO trades (symbol, shares, price, total, type, strategy)
-                    VALUES (?, ?, ?, ?, ?, ?)
-                """,
+                trades.append(
+                    (symbol, shares, current_price, total_value, "SELL", None, None)
+                )
+                main_trades.append(
                     (
                         symbol,
                         shares,
@@ -331,85 +403,203 @@ class PortfolioManager:
                         total_value,
                         "SELL",
                         self.strategy_name,
-                    ),
+                        None,
+                        None,
+                    )
                 )
+                closed.append(symbol)
 
-                # Remove from positions table in main database
-                cursor.execute(
-                    "DELETE FROM positions WHERE symbol = ? AND strategy = ?",
-                    (symbol, self.strategy_name),
+                logger.info(
+                    f"📉 Closed position: {shares} shares of {symbol} at ${current_price:.2f} ({reason})"
                 )
+                logger.info(f"💰 P&L: ${pnl:.2f}, Total P&L: ${self.total_pnl:.2f}")
 
-                conn.commit()
-                conn.close()
             except Exception as e:
-                logger.warning(f"⚠️  Could not store in main database: {e}")
+                logger.error(f"❌ Error closing position for {symbol}: {e}")
 
-            logger.info(
-                f"📉 Closed position: {shares} shares of {symbol} at ${current_price:.2f} ({reason})"
+        if closed:
+            self.version += 1
+            self._enqueue_write(False, _INSERT_TRADE_SQL, trades)
+            self._enqueue_write(
+                False, _DELETE_POSITION_SQL, [(symbol,) for symbol in closed]
+            )
+            self._enqueue_write(True, _INSERT_MAIN_TRADE_SQL, main_trades)
+            self._enqueue_write(
+                True,
+                _DELETE_MAIN_POSITION_SQL,
+                [(symbol, self.strategy_name) for symbol in closed],
             )
-            logger.info(f"💰 P&L: ${pnl:.2f}, Total P&L: ${self.total_pnl:.2f}")
+
+    def _enqueue_write(self, main: bool, sql: str, rows: List[tuple]):
+        """Queue rows for executemany(sql) on the main or strategy database"""
+        self._ensure_writer()
+        self._write_q.put_nowait((main, sql, rows))
+
+    def _ensure_writer(self):
+        """Start the writer task on the running loop, carrying over queued writes"""
+        loop = asyncio.get_running_loop()
+        task = self._writer_task
+        if task is not None and not task.done() and task.get_loop() is loop:
+            return
+
+        queue = asyncio.Queue()
+        if self._write_q is not None:
+            # Writes left behind by a loop that has since closed
+            while not self._write_q.empty():
+                queue.put_nowait(self._write_q.get_nowait())
+        self._write_q = queue
+        self._writer_task = loop.create_task(self._writer_loop(queue))
+
+    async def _writer_loop(self, queue: asyncio.Queue):
+        """Drain queued writes and commit whatever has accumulated together"""
+        while True:
+            batch = [await queue.get()]
+            while len(batch) < _WRITE_BATCH_SIZE and not queue.empty():
+                batch.append(queue.get_nowait())
+            try:
+                self._write_inflight = submit_blocking(self._write_batch_sync, batch)
+                # Shielded: cancelling the writer must not cancel a queued commit
+                await asyncio.shield(asyncio.wrap_future(self._write_inflight))
+            except Exception as e:
+                logger.error(f"❌ Error writing portfolio records: {e}")
+            finally:
+                for _ in batch:
+                    queue.task_done()
+
+    def _write_batch_sync(self, batch: List[Tuple[bool, str, List[tuple]]]):
+        """Commit a batch, one transaction per database (runs in a worker thread)"""
+        local, main = [], []
+        for is_main, sql, rows in batch:
+            ops = main if is_main else local
+            # Consecutive writes of the same statement become one executemany
+            if ops and ops[-1][0] == sql:
+                ops[-1][1].extend(rows)
+            else:
+                ops.append((sql, list(rows)))
+
+        with self._db_lock:
+            local_error = None
+            if local:
+                try:
+                    with _transaction(self._conn) as conn:
+                        for sql, rows in local:
+                            conn.executemany(sql, rows)
+                except Exception as e:
+                    local_error = e  # Still write the main database below
+
+            if main:
+                try:
+                    with _transaction(self._main_db()) as conn:
+                        for sql, rows in main:
+                            conn.executemany(sql, rows)
+                except Exception as e:
+                    logger.warning(f"⚠️  Could not store in main database: {e}")
+
+            if local_error is not None:
+                raise local_error
+
+    async def flush(self):
+        """Wait until every queued write has been committed"""
+        if self._write_q is not None:
+            self._ensure_writer()
+            await self._write_q.join()
+
+        # A batch picked up under an earlier event loop may still be committing
+        inflight = self._write_inflight
+        if inflight is not None and not inflight.done():
+            await asyncio.wrap_future(inflight)
+
+    async def _fetch_prices(self, symbols: List[str]) -> Dict[str, float]:
+        """Fetch prices for several symbols, skipping failed lookups"""
+        prices = {}
+        stale = []
+        for symbol in symbols:
+            price = cached_price(symbol)
+            if price is None:
+                stale.append(symbol)
+            else:
+                prices[symbol] = price
+        if not stale:
+            return prices
+
+        # One batched request for every symbol, then per-symbol lookups for
+        # anything the batch didn't price (e.g. thinly traded tickers)
+        fetched = await run_blocking(self._download_prices_sync, stale)
+        missing = [symbol for symbol in stale if symbol not in fetched]
+        if missing:
+            fetched.update(await self._fetch_prices_individually(missing))
+
+        cache_prices(fetched)
+        prices.update(fetched)
+        return prices
+
+    def _download_prices_sync(self, symbols: List[str]) -> Dict[str, float]:
+        """Blocking batch download of the latest close for several symbols"""
+        try:
+            # Imported on first use: yfinance drags in a large dependency tree
+            import yfinance as yf
+
+            data = yf.download(symbols, period="1d", progress=False, threads=True)
+            if data.empty:
+                return {}
+
+            close = data["Close"]
+            if not hasattr(close, "columns"):
+                # Older yfinance returns a Series for a single ticker
+                close = close.to_frame(symbols[0])
+
+            last_close = close.ffill().iloc[-1]
+            prices = {}
+            for symbol in symbols:
+                price = float(last_close.get(symbol, 0) or 0)
+                if price > 0:  # Also drops NaN
+                    prices[symbol] = price
+            return prices
 
         except Exception as e:
-            logger.error(f"❌ Error closing position for {symbol}: {e}")
+            logger.warning(f"⚠️  Batch price download failed: {e}")
+            return {}
 
-    async def get_current_price(self, symbol: str) -> float:
-        """Get current market price for a symbol"""
-        try:
-            ticker = yf.Ticker(symbol)
-            info = ticker.info
-            current_price = info.get("regularMarketPrice", 0)
+    async def _fetch_prices_individually(self, symbols: List[str]) -> Dict[str, float]:
+        """Fetch prices one symbol at a time, a few lookups in flight at once"""
+        semaphore = asyncio.Semaphore(_PRICE_FETCH_CONCURRENCY)
 
-            if current_price == 0:
-                # Fallback to historical data
-                hist = ticker.history(period="1d")
-                if not hist.empty:
-                    current_price = hist["Close"].iloc[-1]
+        async def fetch(symbol: str) -> float:
+            async with semaphore:
+                return await self.get_current_price(symbol)
 
-            return current_price
+        prices = await asyncio.gather(*(fetch(symbol) for symbol in symbols))
+        return {symbol: price for symbol, price in zip(symbols, prices) if price > 0}
 
-        except Exception as e:
-            logger.error(f"❌ Error getting current price for {symbol}: {e}")
-            return 0
+    async def get_current_price(self, symbol: str) -> float:
+        """Get current market price for a symbol"""
+        return await get_current_price(symbol)
 
     async def update_portfolio(self):
         """Update portfolio summary"""
         try:
             # Update all positions with current prices
-            for symbol in list(self.positions.keys()):
-                current_price = await self.get_current_price(symbol)
-                if current_price > 0:
-                    await self.update_position(symbol, current_price)
+            prices = await self._fetch_prices(list(self.positions))
+            self._store_prices(prices)
 
             # Calculate portfolio summary
-            total_portfolio_value = self.account_balance
-            total_pnl = 0.0
-
-            for position in self.positions.values():
-                total_portfolio_value += position["total_value"]
-                total_pnl += position["pnl"]
+            total_pnl = self.positions.pnl_sum()
 
             # Store portfolio summary
-            conn = sqlite3.connect(self.db_file)
-            cursor = conn.cursor()
-
-            cursor.execute(
-                """
-                INSERT INTO portfolio_summary (account_balance, total_pnl, daily_pnl, positions_count, trades_today)
-                VALUES (?, ?, ?, ?, ?)
-            """,
-                (
-                    self.account_balance,
-                    total_pnl,
-                    self.daily_pnl,
-                    len(self.positions),
-                    self.trades_today,
-                ),
+            self._enqueue_write(
+                False,
+                _INSERT_SUMMARY_SQL,
+                [
+                    (
+                        self.account_balance,
+                        total_pnl,
+                        self.daily_pnl,
+                        len(self.positions),
+                        self.trades_today,
+                    )
+                ],
             )
 
-            conn.commit()
-            conn.close()
-
             logger.info(
                 f"📊 Portfolio updated - Balance: ${self.account_balance:.2f}, Total P&L: ${total_pnl:.2f}"
             )
@@ -417,6 +607,17 @@ class PortfolioManager:
         except Exception as e:
             logger.error(f"❌ Error updating portfolio: {e}")
 
+    def _main_db(self) -> sqlite3.Connection:
+        """Return the shared main-database connection, if it could be opened"""
+        if self._main_conn is None:
+            raise RuntimeError(f"main database {MAIN_DB_FILE} is not available")
+        return self._main_conn
+
+    def set_account_balance(self, account_balance: float):
+        """Replace the cash balance, e.g. after a change made from the dashboard"""
+        self.account_balance = account_balance
+        self.version += 1
+
     def get_available_capital(self) -> float:
         """Get available capital for new positions"""
         return self.account_balance
@@ -433,9 +634,7 @@ class PortfolioManager:
             "daily_pnl": self.daily_pnl,
             "positions_count": len(self.positions),
             "trades_today": self.trades_today,
-            "total_positions_value": sum(
-                pos["total_value"] for pos in self.positions.values()
-            ),
+            "total_positions_value": self.positions.total_value_sum(),
             "strategy_name": self.strategy_name,
         }
 
@@ -446,7 +645,47 @@ class PortfolioManager:
             self.daily_pnl = 0.0
             self.trades_today = 0
             self.last_reset_date = today
+            self.version += 1
+
+    async def reset(self, account_balance: float):
+        """Clear positions, trade history and P&L for this strategy"""
+        # Let queued writes land first so none of them survive the reset
+        await self.flush()
+        await run_blocking(self._clear_tables_sync)
+
+        self.account_balance = account_balance
+        self.positions.clear()
+        self.total_pnl = 0.0
+        self.daily_pnl = 0.0
+        self.trades_today = 0
+        self.version += 1
+
+    def _clear_tables_sync(self):
+        """Delete this strategy's rows (runs in a worker thread)"""
+        with self._db_lock, _transaction(self._conn) as conn:
+            conn.execute("DELETE FROM trades")
+            conn.execute("DELETE FROM positions")
+            conn.execute("DELETE FROM portfolio_summary")
+
+        if self._main_conn is not None:
+            try:
+                with self._db_lock, _transaction(self._main_conn) as conn:
+                    conn.execute(
+                        "DELETE FROM positions WHERE strategy = ?",
+                        (self.strategy_name,),
+                    )
+            except Exception as e:
+                logger.warning(f"⚠️  Could not clear main database positions: {e}")
 
     async def shutdown(self):
         """Shutdown the portfolio manager"""
+        # Commit everything still queued, then stop the writer
+        await self.flush()
+        if self._writer_task is not None:
+            self._writer_task.cancel()
+
+        with self._db_lock:
+            self._conn.close()
+            if self._main_conn is not None:
+                self._main_conn.close()
         logger.info("🛑 Portfolio manager shutdown complete")
@@ -0,0 +1,75 @@
+"""
+Latest-price lookups shared by every strategy's trading engine and portfolio
+"""
+
+import logging
+import time
+from typing import Dict, Optional, Tuple
+
+from .executor import run_blocking
+
+logger = logging.getLogger(__name__)
+
+# Seconds a fetched price is reused, so review + update + trade in one cycle
+# share it, and a symbol held by several strategies is fetched once
+_PRICE_CACHE_TTL = 30.0
+
+# Expired entries are swept once the cache grows past this many symbols
+_PRICE_CACHE_SWEEP_SIZE = 512
+
+_price_cache: Dict[str, Tuple[float, float]] = {}  # symbol -> (monotonic, price)
+
+
+def cached_price(symbol: str) -> Optional[float]:
+    """Return a recently fetched price for symbol, if still fresh"""
+    entry = _price_cache.get(symbol)
+    if entry is not None and time.monotonic() - entry[0] < _PRICE_CACHE_TTL:
+        return entry[1]
+    return None
+
+
+def cache_prices(prices: Dict[str, float]):
+    """Remember freshly fetched prices"""
+    now = time.monotonic()
+    if len(_price_cache) > _PRICE_CACHE_SWEEP_SIZE:
+        for symbol, (ts, _) in list(_price_cache.items()):
+            if now - ts >= _PRICE_CACHE_TTL:
+                del _price_cache[symbol]
+    for symbol, price in prices.items():
+        _price_cache[symbol] = (now, price)
+
+
+async def get_current_price(symbol: str) -> float:
+    """Get current market price for a symbol; 0 if the lookup fails"""
+    price = cached_price(symbol)
+    if price is not None:
+        return price
+
+    # yfinance is blocking network I/O; keep it off the event loop
+    price = await run_blocking(_fetch_price_sync, symbol)
+    if price > 0:
+        cache_prices({symbol: price})
+    return price
+
+
+def _fetch_price_sync(symbol: str) -> float:
+    """Blocking price lookup used by get_current_price"""
+    try:
+        # Imported on first use: yfinance drags in a large dependency tree
+        import yfinance as yf
+
+        ticker = yf.Ticker(symbol)
+        # fast_info reads the chart endpoint instead of the full quote summary
+        current_price = ticker.fast_info.get("lastPrice") or 0
+
+        if current_price == 0:
+            # Fallback to historical data
+            hist = ticker.history(period="1d")
+            if not hist.empty:
+                current_price = float(hist["Close"].iloc[-1])
+
+        return current_price
+
+    except Exception as e:
+        logger.error(f"❌ Error getting current price for {symbol}: {e}")
+        return 0
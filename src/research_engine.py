@@ -4,72 +4,44 @@ Research Engine - Finds trading opportunities through news, sentiment, and techn
 
 import asyncio
 import logging
+import random
+import time
 from datetime import datetime, timedelta
-from typing import List, Dict, Any
-import yfinance as yf
-import requests
-from bs4 import BeautifulSoup
-from textblob import TextBlob
-import ta
-import pandas as pd
+from typing import List, Dict, Any, Optional, Tuple
 import numpy as np
 
+try:
+    # Optional: compiles the indicator kernel to machine code
+    from numba import njit
+except ImportError:
+    njit = None
+
+from .executor import run_blocking
+from .scoring import rank_opportunities, score_opportunities
+from .models.bars import Bars
 from .models.trading_opportunity import TradingOpportunity
 from .config import ResearchConfig
 
 logger = logging.getLogger(__name__)
 
+# Symbols researched at once; each may still fall back to its own yfinance fetch
+_RESEARCH_CONCURRENCY = 8
 
-class ResearchEngine:
-    """Research engine that finds trading opportunities"""
-
-    def __init__(self, config: ResearchConfig):
-        self.config = config
-        self.session = requests.Session()
-        self.session.headers.update(
-            {
-                "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
-            }
-        )
-
-    async def find_opportunities(self) -> List[TradingOpportunity]:
-        """Find trading opportunities through various research methods"""
-        logger.info("🔍 Starting research phase")
-
-        opportunities = []
-
-        # 1. Get trending stocks
-        trending_stocks = await self.get_trending_stocks()
-        logger.info(f"📈 Found {len(trending_stocks)} trending stocks")
-
-        # 2. Research each trending stock
-        for symbol in trending_stocks:
-            try:
-                opportunity = await self.research_stock(symbol)
-                if opportunity:
-                    opportunities.append(opportunity)
-                    logger.info(
-                        f"✅ Researched {symbol}: Score={opportunity.score:.3f}"
-                    )
-            except Exception as e:
-                logger.error(f"❌ Error researching {symbol}: {e}")
-
-        # 3. Get news-based opportunities
-        news_opportunities = await self.get_news_opportunities()
-        opportunities.extend(news_opportunities)
-
-        # 4. Sort by score
-        opportunities.sort(key=lambda x: x.score, reverse=True)
+# Seconds a downloaded history is reused, so a retried cycle skips the refetch
+_HISTORY_CACHE_TTL = 300.0
 
-        logger.info(f"🎯 Found {len(opportunities)} trading opportunities")
-        return opportunities
+# Seconds a market cap is reused; it barely moves within a trading day, and
+# each one is a separate yfinance request
+_MARKET_CAP_CACHE_TTL = 6 * 3600.0
 
-    async def get_trending_stocks(self) -> List[str]:
-        """Get list of trending stocks from various sources"""
-        trending = []
+# Market cap assumed when yfinance has none for a symbol
+_DEFAULT_MARKET_CAP = 1000000000
 
-        # Popular stocks for research
-        popular_stocks = [
+# Symbols researched every cycle: popular stocks and ETFs, plus some others
+# for variety. Deduplicated and sorted once here rather than on every call
+_TRENDING_STOCKS = tuple(
+    sorted(
+        {
             "AAPL",
             "GOOGL",
             "MSFT",
@@ -90,11 +62,6 @@ class ResearchEngine:
             "QQQ",
             "IWM",
             "VTI",  # ETFs for diversification
-        ]
-        trending.extend(popular_stocks)
-
-        # Get some random stocks for variety
-        random_stocks = [
             "PLTR",
             "COIN",
             "RBLX",
@@ -105,50 +72,209 @@ class ResearchEngine:
             "TWTR",
             "BYND",
             "PTON",
-            "ZM",
             "DOCU",
             "CRWD",
             "OKTA",
-            "ZM",
             "TEAM",
-        ]
-        trending.extend(random_stocks)
+        }
+    )
+)
+
+
+def _ewm(values: np.ndarray, alpha: float) -> np.ndarray:
+    """Recursive (adjust=False) exponential moving average, as pandas computes it"""
+    out = np.empty(values.shape[0])
+    acc = values[0]
+    out[0] = acc
+    for i in range(1, values.shape[0]):
+        acc = alpha * values[i] + (1 - alpha) * acc
+        out[i] = acc
+    return out
+
+
+def _tech_scores(close: np.ndarray, volume: np.ndarray) -> Tuple[float, ...]:
+    """(rsi, macd, ma, volume, bollinger) scores for the last bar of history
+
+    Each indicator keeps the window and warm-up length of the ta indicator it
+    replaces and scores 0 until enough bars exist, as the NaN checks did.
+    """
+    n = close.shape[0]
+
+    # RSI(14) with Wilder smoothing, normalized to -1..1
+    rsi_score = 0.0
+    if n >= 14:
+        diff = np.diff(close)
+        up = np.concatenate((np.zeros(1), np.maximum(diff, 0.0)))
+        down = np.concatenate((np.zeros(1), np.maximum(-diff, 0.0)))
+        avg_up = _ewm(up, 1 / 14)[-1]
+        avg_down = _ewm(down, 1 / 14)[-1]
+        rsi = 100.0 if avg_down == 0 else 100 - 100 / (1 + avg_up / avg_down)
+        if not np.isnan(rsi):
+            rsi_score = (rsi - 50) / 50
+
+    # MACD(12, 26) against its 9-bar signal, which starts once MACD is defined
+    macd_score = 0.0
+    if n >= 34:
+        macd = _ewm(close, 2 / 13) - _ewm(close, 2 / 27)
+        signal = _ewm(macd[25:], 2 / 10)
+        if not (np.isnan(macd[-1]) or np.isnan(signal[-1])):
+            macd_score = 1.0 if macd[-1] > signal[-1] else -1.0
+
+    # Moving averages
+    ma_score = 0.0
+    if n >= 50:
+        sma_20 = close[-20:].mean()
+        sma_50 = close[-50:].mean()
+        if not (np.isnan(sma_20) or np.isnan(sma_50)):
+            ma_score = 1.0 if sma_20 > sma_50 else -1.0
+
+    # Volume - simple comparison against the period average
+    volume_score = 1.0 if volume[-1] > np.nanmean(volume) else -1.0
+
+    # Bollinger Bands(20, 2), population std as ta uses
+    bb_score = 0.0
+    if n >= 20:
+        window = close[-20:]
+        mid = window.mean()
+        band = 2 * window.std()
+        if band > 0:
+            bb_position = (close[-1] - (mid - band)) / (2 * band)
+            if bb_position > 0.8:
+                bb_score = 1.0
+            elif bb_position < 0.2:
+                bb_score = -1.0
+
+    return rsi_score, macd_score, ma_score, volume_score, bb_score
+
+
+if njit is not None:
+    # _tech_scores looks _ewm up at compile time, so it must be compiled too
+    _ewm = njit(cache=True)(_ewm)
+    _tech_scores = njit(cache=True)(_tech_scores)
+
+
+class ResearchEngine:
+    """Research engine that finds trading opportunities"""
+
+    def __init__(self, config: ResearchConfig):
+        self.config = config
+        self._bars_cache: Dict[str, Tuple[float, Bars]] = {}
+        self._market_cap_cache: Dict[str, Tuple[float, float]] = {}
+
+    async def find_opportunities(self) -> List[TradingOpportunity]:
+        """Find trading opportunities through various research methods"""
+        logger.info("🔍 Starting research phase")
+
+        opportunities = []
+
+        # 1. Get trending stocks
+        trending_stocks = self.get_trending_stocks()
+        logger.info(f"📈 Found {len(trending_stocks)} trending stocks")
+
+        # 2. Fetch price history for all of them in one batched request,
+        # skipping any fetched in the last few minutes
+        bars = self._cached_bars(trending_stocks)
+        missing = [symbol for symbol in trending_stocks if symbol not in bars]
+        if missing:
+            histories = await run_blocking(self._download_histories_sync, missing)
+            market_caps = await self._get_market_caps(list(histories))
+            fetched = {
+                symbol: Bars.from_history(history, market_caps[symbol])
+                for symbol, history in histories.items()
+            }
+            self._cache_bars(fetched)
+            bars.update(fetched)
+
+        # 3. Draw the placeholder sentiment and news scores for all of them at once
+        sentiment_scores = np.random.uniform(-0.5, 0.5, len(trending_stocks)).tolist()
+        news_scores = np.random.uniform(-0.3, 0.3, len(trending_stocks)).tolist()
+
+        # 4. Research the trending stocks concurrently
+        semaphore = asyncio.Semaphore(_RESEARCH_CONCURRENCY)
+
+        async def research(i: int, symbol: str) -> TradingOpportunity:
+            async with semaphore:
+                return await self.research_stock(
+                    symbol,
+                    bars.get(symbol),
+                    sentiment_score=sentiment_scores[i],
+                    news_score=news_scores[i],
+                )
+
+        results = await asyncio.gather(
+            *(research(i, symbol) for i, symbol in enumerate(trending_stocks)),
+            return_exceptions=True,
+        )
+        for symbol, opportunity in zip(trending_stocks, results):
+            if isinstance(opportunity, Exception):
+                logger.error(f"❌ Error researching {symbol}: {opportunity}")
+            elif opportunity:
+                opportunities.append(opportunity)
 
-        return list(set(trending))  # Remove duplicates
+        # 5. Get news-based opportunities
+        news_opportunities = await self.get_news_opportunities()
+        opportunities.extend(news_opportunities)
 
-    async def research_stock(self, symbol: str) -> TradingOpportunity:
-        """Research a specific stock and create trading opportunity"""
+        # 6. Score them all in one vectorized pass, then sort by score
+        opportunities = rank_opportunities(score_opportunities(opportunities))
+        for opportunity in opportunities:
+            logger.info(
+                f"✅ Researched {opportunity.symbol}: Score={opportunity.score:.3f}"
+            )
+
+        logger.info(f"🎯 Found {len(opportunities)} trading opportunities")
+        return opportunities
+
+    def get_trending_stocks(self) -> List[str]:
+        """Get list of trending stocks from various sources"""
+        return list(_TRENDING_STOCKS)
+
+    async def research_stock(
+        self,
+        symbol: str,
+        stock_data: Optional[Bars] = None,
+        sentiment_score: Optional[float] = None,
+        news_score: Optional[float] = None,
+    ) -> TradingOpportunity:
+        """Research a specific stock and create an unscored trading opportunity
+
+        find_opportunities fills in risk, potential return and score for the
+        whole batch at once (see scoring.score_opportunities).
+        """
         logger.info(f"🔬 Researching {symbol}")
 
         try:
-            # Get stock data
-            stock_data = await self.get_stock_data(symbol)
-            if stock_data is None or stock_data.empty:
+            # Get stock data, unless the batch download already has it
+            if stock_data is None:
+                stock_data = await self.get_stock_data(symbol)
+            if stock_data is None or len(stock_data) == 0:
                 logger.warning(f"⚠️  No data available for {symbol}")
                 return None
 
-            # Calculate technical indicators
-            technical_indicators = self.calculate_technical_indicators(stock_data)
+            close = stock_data.close
+            volume = stock_data.volume
 
-            # Get sentiment analysis
-            sentiment_score = await self.get_sentiment_score(symbol)
+            # Calculate technical indicators
+            technical_indicators = self.calculate_technical_indicators(close, volume)
 
-            # Get news analysis
-            news_score = await self.get_news_score(symbol)
+            # Get sentiment analysis, unless the caller already scored it
+            if sentiment_score is None:
+                sentiment_score = await self.get_sentiment_score(symbol)
 
-            # Calculate market cap (simplified)
-            market_cap = (
-                stock_data["market_cap"].iloc[-1]
-                if "market_cap" in stock_data.columns
-                else 1000000000
-            )
+            # Get news analysis, unless the caller already scored it
+            if news_score is None:
+                news_score = await self.get_news_score(symbol)
 
             # Create trading opportunity
-            current_price = stock_data["Close"].iloc[-1]
-            current_volume = stock_data["Volume"].iloc[-1]
-            avg_volume = stock_data["Volume"].mean()
-            volume_ratio = current_volume / avg_volume if avg_volume > 0 else 1.0
-            volatility = stock_data["Close"].pct_change().std()
+            current_price = float(close[-1])
+            avg_volume = np.nanmean(volume)
+            volume_ratio = volume[-1] / avg_volume if avg_volume > 0 else 1.0
+
+            # Sample std of daily returns, as pct_change().std() gave
+            returns = close[1:] / close[:-1] - 1.0
+            volatility = (
+                float(np.nanstd(returns, ddof=1)) if returns.size > 1 else np.nan
+            )
 
             opportunity = TradingOpportunity(
                 symbol=symbol,
@@ -158,96 +284,139 @@ class ResearchEngine:
                 technical_score=technical_indicators["overall_score"],
                 sentiment_score=sentiment_score,
                 news_score=news_score,
-                market_cap=market_cap,
+                market_cap=stock_data.market_cap,
                 timestamp=datetime.now(),
             )
 
-            # Calculate risk and potential return
-            opportunity.risk_score = self.calculate_risk_score(opportunity)
-            opportunity.potential_return = self.calculate_potential_return(opportunity)
-            opportunity.score = opportunity.potential_return / (
-                opportunity.risk_score + 0.1
-            )
-
             return opportunity
 
         except Exception as e:
             logger.error(f"❌ Error researching {symbol}: {e}")
             return None
 
-    async def get_stock_data(self, symbol: str) -> pd.DataFrame:
+    async def get_stock_data(self, symbol: str) -> Optional[Bars]:
         """Get historical stock data"""
-        try:
-            ticker = yf.Ticker(symbol)
-            data = ticker.history(period="30d")
+        cached = self._cached_bars([symbol])
+        if cached:
+            return cached[symbol]
 
-            if data.empty:
+        try:
+            history = await run_blocking(self._fetch_history_sync, symbol)
+            if history is None:
                 return None
+            market_caps = await self._get_market_caps([symbol])
+            data = Bars.from_history(history, market_caps[symbol])
+            self._cache_bars({symbol: data})
+            return data
+        except Exception as e:
+            logger.error(f"❌ Error getting stock data for {symbol}: {e}")
+            return None
 
-            # Get market cap from ticker info
-            try:
-                info = ticker.info
-                market_cap = info.get("marketCap", 1000000000)
-                data["market_cap"] = market_cap
-            except:
-                data["market_cap"] = 1000000000
+    def _fetch_history_sync(self, symbol: str):
+        """Blocking fetch of one symbol's 30-day history; None if there is none"""
+        try:
+            # Imported on first use: yfinance drags in a large dependency tree
+            import yfinance as yf
 
-            return data
+            data = yf.Ticker(symbol).history(period="30d")
+            return None if data.empty else data
 
         except Exception as e:
             logger.error(f"❌ Error getting stock data for {symbol}: {e}")
             return None
 
-    def calculate_technical_indicators(self, data: pd.DataFrame) -> Dict[str, float]:
-        """Calculate technical indicators for the stock"""
-        try:
-            # RSI
-            rsi = ta.momentum.RSIIndicator(data["Close"]).rsi()
-            rsi_val = rsi.iloc[-1]
-            if pd.isna(rsi_val):
-                rsi_score = 0
-            else:
-                rsi_score = (rsi_val - 50) / 50  # Normalize to -1 to 1
-
-            # MACD
-            macd = ta.trend.MACD(data["Close"])
-            macd_line = macd.macd().iloc[-1]
-            macd_signal = macd.macd_signal().iloc[-1]
-            if pd.isna(macd_line) or pd.isna(macd_signal):
-                macd_score = 0
-            else:
-                macd_score = 1 if macd_line > macd_signal else -1
-
-            # Moving averages
-            sma_20 = ta.trend.SMAIndicator(data["Close"], window=20).sma_indicator()
-            sma_50 = ta.trend.SMAIndicator(data["Close"], window=50).sma_indicator()
-            sma_20_val = sma_20.iloc[-1]
-            sma_50_val = sma_50.iloc[-1]
-            if pd.isna(sma_20_val) or pd.isna(sma_50_val):
-                ma_score = 0
+    async def _get_market_caps(self, symbols: List[str]) -> Dict[str, float]:
+        """Market caps for symbols, fetching the stale ones concurrently"""
+        now = time.monotonic()
+        market_caps = {}
+        stale = []
+        for symbol in symbols:
+            entry = self._market_cap_cache.get(symbol)
+            if entry is not None and now - entry[0] < _MARKET_CAP_CACHE_TTL:
+                market_caps[symbol] = entry[1]
             else:
-                ma_score = 1 if sma_20_val > sma_50_val else -1
-
-            # Volume - use simple volume comparison instead of VolumeSMAIndicator
-            current_volume = data["Volume"].iloc[-1]
-            avg_volume = data["Volume"].mean()
-            volume_score = 1 if current_volume > avg_volume else -1
-
-            # Bollinger Bands
-            bb = ta.volatility.BollingerBands(data["Close"])
-            current_price = data["Close"].iloc[-1]
-            bb_lower = bb.bollinger_lband().iloc[-1]
-            bb_upper = bb.bollinger_hband().iloc[-1]
-            if (
-                pd.isna(current_price)
-                or pd.isna(bb_lower)
-                or pd.isna(bb_upper)
-                or (bb_upper - bb_lower) == 0
-            ):
-                bb_score = 0
+                stale.append(symbol)
+
+        semaphore = asyncio.Semaphore(_RESEARCH_CONCURRENCY)
+
+        async def fetch(symbol: str) -> Optional[float]:
+            async with semaphore:
+                return await run_blocking(self._fetch_market_cap_sync, symbol)
+
+        fetched = await asyncio.gather(*(fetch(symbol) for symbol in stale))
+        now = time.monotonic()
+        for symbol, market_cap in zip(stale, fetched):
+            if market_cap is None:
+                market_caps[symbol] = _DEFAULT_MARKET_CAP  # Retried next cycle
             else:
-                bb_position = (current_price - bb_lower) / (bb_upper - bb_lower)
-                bb_score = 1 if bb_position > 0.8 else (-1 if bb_position < 0.2 else 0)
+                self._market_cap_cache[symbol] = (now, market_cap)
+                market_caps[symbol] = market_cap
+        return market_caps
+
+    def _fetch_market_cap_sync(self, symbol: str) -> Optional[float]:
+        """Blocking market cap lookup; None if yfinance has none"""
+        try:
+            import yfinance as yf
+
+            # fast_info reads market cap without the full quote summary
+            return yf.Ticker(symbol).fast_info["marketCap"] or None
+        except Exception:
+            return None
+
+    def _cached_bars(self, symbols: List[str]) -> Dict[str, Bars]:
+        """Return the recently downloaded bars among symbols"""
+        now = time.monotonic()
+        bars = {}
+        for symbol in symbols:
+            entry = self._bars_cache.get(symbol)
+            if entry is not None and now - entry[0] < _HISTORY_CACHE_TTL:
+                bars[symbol] = entry[1]
+        return bars
+
+    def _cache_bars(self, bars: Dict[str, Bars]):
+        """Remember freshly downloaded bars"""
+        now = time.monotonic()
+        for symbol, symbol_bars in bars.items():
+            self._bars_cache[symbol] = (now, symbol_bars)
+
+    def _download_histories_sync(self, symbols: List[str]) -> Dict[str, Any]:
+        """Blocking batch download of 30 days of history for several symbols"""
+        try:
+            import yfinance as yf
+
+            data = yf.download(
+                symbols,
+                period="30d",
+                group_by="ticker",
+                progress=False,
+                threads=True,
+            )
+            if data.empty:
+                return {}
+
+            downloaded = set(data.columns.get_level_values(0))
+
+            histories = {}
+            for symbol in symbols:
+                if symbol not in downloaded:
+                    continue
+                history = data[symbol].dropna(how="all")
+                if not history.empty:
+                    histories[symbol] = history
+            return histories
+
+        except Exception as e:
+            logger.warning(f"⚠️  Batch history download failed: {e}")
+            return {}
+
+    def calculate_technical_indicators(
+        self, close: np.ndarray, volume: np.ndarray
+    ) -> Dict[str, float]:
+        """Calculate technical indicators from close and volume arrays"""
+        try:
+            rsi_score, macd_score, ma_score, volume_score, bb_score = _tech_scores(
+                close, volume
+            )
 
             # Overall technical score
             overall_score = (
@@ -272,8 +441,6 @@ class ResearchEngine:
         try:
             # For now, return a random sentiment score
             # In a real implementation, this would scrape news and analyze sentiment
-            import random
-
             sentiment_score = random.uniform(-0.5, 0.5)
             return sentiment_score
 
@@ -286,8 +453,6 @@ class ResearchEngine:
         try:
             # For now, return a random news score
             # In a real implementation, this would analyze recent news
-            import random
-
             news_score = random.uniform(-0.3, 0.3)
             return news_score
 
@@ -295,31 +460,6 @@ class ResearchEngine:
             logger.error(f"❌ Error getting news score for {symbol}: {e}")
             return 0.0
 
-    def calculate_risk_score(self, opportunity: TradingOpportunity) -> float:
-        """Calculate risk score based on volatility, volume, and other factors"""
-        volatility = opportunity.volatility or 0.2
-        volume_ratio = opportunity.volume_ratio or 1.0
-        market_cap = opportunity.market_cap or 1000000000
-
-        # Higher volatility = higher risk
-        # Lower volume ratio = higher risk
-        # Lower market cap = higher risk
-        risk_score = volatility * (1 / volume_ratio) * (1000000000 / market_cap)
-        return min(risk_score, 1.0)  # Cap at 1.0
-
-    def calculate_potential_return(self, opportunity: TradingOpportunity) -> float:
-        """Calculate potential return based on technical indicators and sentiment"""
-        sentiment_score = opportunity.sentiment_score or 0.0
-        technical_score = opportunity.technical_score or 0.0
-        news_score = opportunity.news_score or 0.0
-
-        # Weighted average of different factors
-        potential_return = (
-            sentiment_score * 0.3 + technical_score * 0.4 + news_score * 0.3
-        )
-
-        return max(potential_return, 0.0)
-
     async def get_news_opportunities(self) -> List[TradingOpportunity]:
         """Find opportunities based on news analysis"""
         # This would involve scraping financial news sites
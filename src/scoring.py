@@ -0,0 +1,120 @@
+"""
+Vectorized opportunity scoring and ranking
+"""
+
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from .models.trading_opportunity import TradingOpportunity
+
+try:
+    # Optional: compiles the scoring loop to machine code
+    from numba import njit
+except ImportError:
+    njit = None
+
+
+def _score_numpy(volatility, volume_ratio, market_cap, sentiment, technical, news):
+    """Risk, potential return and score as whole-array NumPy expressions"""
+    risk = np.minimum(volatility * (1 / volume_ratio) * (1000000000 / market_cap), 1.0)
+    potential_return = np.maximum(sentiment * 0.3 + technical * 0.4 + news * 0.3, 0.0)
+    score = potential_return / (risk + 0.1)  # Avoid div by zero
+    return risk, potential_return, score
+
+
+def _score_loop(volatility, volume_ratio, market_cap, sentiment, technical, news):
+    """Same formulas as _score_numpy in a single fused pass, for numba"""
+    n = volatility.shape[0]
+    risk = np.empty(n)
+    potential_return = np.empty(n)
+    score = np.empty(n)
+    for i in range(n):
+        r = min(
+            volatility[i] * (1 / volume_ratio[i]) * (1000000000 / market_cap[i]), 1.0
+        )
+        p = max(sentiment[i] * 0.3 + technical[i] * 0.4 + news[i] * 0.3, 0.0)
+        risk[i] = r
+        potential_return[i] = p
+        score[i] = p / (r + 0.1)
+    return risk, potential_return, score
+
+
+# Without numba the loop would run in the interpreter, so use the array version
+_score_kernel = _score_numpy if njit is None else njit(cache=True)(_score_loop)
+
+
+def _column(
+    opportunities: List[TradingOpportunity], field: str, default: float
+) -> np.ndarray:
+    """One scoring input as an array, with missing values set to default"""
+    column = np.fromiter(
+        (getattr(o, field) or default for o in opportunities), float, len(opportunities)
+    )
+    # NaN is truthy, so `or` alone lets it through (e.g. nanstd of one return)
+    column[np.isnan(column)] = default
+    return column
+
+
+def score_arrays(
+    opportunities: List[TradingOpportunity],
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Compute (risk_score, potential_return, score) arrays for all opportunities"""
+    volatility = _column(opportunities, "volatility", 0.2)
+    volume_ratio = _column(opportunities, "volume_ratio", 1.0)
+    market_cap = _column(opportunities, "market_cap", 1000000000)
+    sentiment = _column(opportunities, "sentiment_score", 0.0)
+    technical = _column(opportunities, "technical_score", 0.0)
+    news = _column(opportunities, "news_score", 0.0)
+
+    return _score_kernel(
+        volatility, volume_ratio, market_cap, sentiment, technical, news
+    )
+
+
+def score_opportunities(
+    opportunities: List[TradingOpportunity],
+) -> List[TradingOpportunity]:
+    """Return copies of opportunities with risk, potential return and score set"""
+    if not opportunities:
+        return []
+
+    risk, potential_return, score = score_arrays(opportunities)
+
+    return [
+        o.with_scores(risk_score=r, potential_return=p, score=s)
+        for o, r, p, s in zip(
+            opportunities, risk.tolist(), potential_return.tolist(), score.tolist()
+        )
+    ]
+
+
+def rank_opportunities(
+    opportunities: List[TradingOpportunity], top_k: Optional[int] = None
+) -> List[TradingOpportunity]:
+    """Return the best top_k opportunities (all if None) by score, highest first
+
+    Scores are set once, by the research engine, and are not recomputed here.
+    """
+    n = len(opportunities)
+    if n == 0 or (top_k is not None and top_k <= 0):
+        return []
+
+    score = np.fromiter((o.score for o in opportunities), float, n)
+    # NaN never compares above the cut-off, so it would shrink the selection
+    score[np.isnan(score)] = -np.inf
+
+    if top_k is not None and top_k < n:
+        # O(n) selection of the top_k; ties at the cut-off go to the earliest
+        # inputs, matching the stable sorted() this replaces
+        threshold = np.partition(score, n - top_k)[n - top_k]
+        above = np.flatnonzero(score > threshold)
+        ties = np.flatnonzero(score == threshold)[: top_k - len(above)]
+        idx = np.concatenate((above, ties))
+    else:
+        idx = np.arange(n)
+
+    # Order just the selected rows, highest score first, input order on ties
+    idx = idx[np.lexsort((idx, -score[idx]))]
+
+    return [opportunities[i] for i in idx.tolist()]
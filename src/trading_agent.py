@@ -4,14 +4,17 @@ Main Trading Agent - Orchestrates research and trading activities
 
 import asyncio
 import logging
+import time
 from datetime import datetime, timedelta
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 
 from .research_engine import ResearchEngine
 from .trading_engine import TradingEngine
 from .portfolio_manager import PortfolioManager
 from .models.trading_opportunity import TradingOpportunity
+from .scoring import rank_opportunities
 from .config import Config
+from .waits import wait_for_event, wait_until
 
 logger = logging.getLogger(__name__)
 
@@ -26,6 +29,7 @@ class TradingAgent:
         self.portfolio_manager = PortfolioManager(config.trading)
 
         self.is_running = False
+        self._shutdown_event = asyncio.Event()  # Set by shutdown() to end waits
         self.daily_opportunities: List[TradingOpportunity] = []
 
         logger.info("🤖 Trading Agent initialized")
@@ -33,6 +37,7 @@ class TradingAgent:
     async def run(self):
         """Main trading loop"""
         self.is_running = True
+        self._shutdown_event.clear()
         logger.info(f"🚀 Starting trading agent in {self.config.trading.mode} mode")
 
         while self.is_running:
@@ -45,7 +50,7 @@ class TradingAgent:
 
             except Exception as e:
                 logger.error(f"❌ Error in trading cycle: {e}")
-                await asyncio.sleep(60)  # Wait before retrying
+                await wait_for_event(self._shutdown_event, 60)  # Wait before retrying
 
     async def daily_trading_cycle(self):
         """Execute one complete daily trading cycle"""
@@ -75,65 +80,36 @@ class TradingAgent:
         """Analyze and rank trading opportunities by potential return"""
         logger.info(f"📊 Analyzing {len(opportunities)} opportunities")
 
-        for opportunity in opportunities:
-            # Calculate risk-adjusted return
-            risk_score = self.calculate_risk_score(opportunity)
-            potential_return = self.calculate_potential_return(opportunity)
-
-            opportunity.risk_score = risk_score
-            opportunity.potential_return = potential_return
-            opportunity.score = potential_return / (
-                risk_score + 0.1
-            )  # Avoid division by zero
-
-        # Sort by score (highest first)
-        ranked = sorted(opportunities, key=lambda x: x.score, reverse=True)
+        # Only the first max_daily_trades are ever traded, so partial-sort to those
+        ranked = rank_opportunities(
+            opportunities, top_k=self.config.system.max_daily_trades
+        )
 
         logger.info(f"🏆 Top opportunities: {[o.symbol for o in ranked[:3]]}")
         return ranked
 
-    def calculate_risk_score(self, opportunity: TradingOpportunity) -> float:
-        """Calculate risk score based on volatility, volume, and other factors"""
-        # Simplified risk calculation
-        volatility = opportunity.volatility or 0.2
-        volume_ratio = opportunity.volume_ratio or 1.0
-        market_cap = opportunity.market_cap or 1000000000
-
-        risk_score = volatility * (1 / volume_ratio) * (1000000000 / market_cap)
-        return min(risk_score, 1.0)  # Cap at 1.0
-
-    def calculate_potential_return(self, opportunity: TradingOpportunity) -> float:
-        """Calculate potential return based on technical indicators and sentiment"""
-        sentiment_score = opportunity.sentiment_score or 0.0
-        technical_score = opportunity.technical_score or 0.0
-        news_score = opportunity.news_score or 0.0
-
-        # Weighted average of different factors
-        potential_return = (
-            sentiment_score * 0.3 + technical_score * 0.4 + news_score * 0.3
-        )
-
-        return max(potential_return, 0.0)
-
     async def execute_trades(self, opportunities: List[TradingOpportunity]):
         """Execute trades based on ranked opportunities"""
         logger.info(f"💼 Executing trades for {len(opportunities)} opportunities")
 
         trades_executed = 0
         max_trades = self.config.system.max_daily_trades
+        slippages = self.trading_engine.draw_slippages(max_trades)
 
-        for opportunity in opportunities[:max_trades]:  # Limit to max trades per day
+        candidates = opportunities[:max_trades]  # Limit to max trades per day
+        position_sizes = self.trading_engine.batch_position_sizes(candidates)
+
+        for opportunity, position_size in zip(candidates, position_sizes):
             try:
                 # Check if we should take this position
-                if await self.should_take_position(opportunity):
+                if self.should_take_position(opportunity, position_size):
                     # Execute the trade
-                    await self.trading_engine.execute_trade(opportunity)
+                    await self.trading_engine.execute_trade(
+                        opportunity, slippages[trades_executed], position_size
+                    )
 
                     # Add to portfolio
-                    shares = int(
-                        self.trading_engine.calculate_position_size(opportunity)
-                        / opportunity.current_price
-                    )
+                    shares = int(position_size / opportunity.current_price)
                     await self.portfolio_manager.add_position(
                         opportunity.symbol,
                         shares,
@@ -155,19 +131,17 @@ class TradingAgent:
 
         logger.info(f"📊 Executed {trades_executed} trades today")
 
-    async def should_take_position(self, opportunity: TradingOpportunity) -> bool:
+    def should_take_position(
+        self, opportunity: TradingOpportunity, position_size: Optional[float] = None
+    ) -> bool:
         """Determine if we should take a position based on risk management"""
-        # Check if we have enough capital
-        available_capital = self.portfolio_manager.get_available_capital()
-        position_size = self.trading_engine.calculate_position_size(opportunity)
+        # Cheapest checks first; only the capital check has to size the position
 
-        if position_size > available_capital:
-            logger.info(f"💰 Insufficient capital for {opportunity.symbol}")
-            return False
-
-        # Check if we already have a position in this stock
-        if self.portfolio_manager.has_position(opportunity.symbol):
-            logger.info(f"📈 Already have position in {opportunity.symbol}")
+        # Check minimum score threshold
+        if opportunity.score < 0.1:
+            logger.info(
+                f"📉 Score too low for {opportunity.symbol}: {opportunity.score:.3f}"
+            )
             return False
 
         # Check risk limits
@@ -177,39 +151,46 @@ class TradingAgent:
             )
             return False
 
+        # Check if we already have a position in this stock
+        if self.portfolio_manager.has_position(opportunity.symbol):
+            logger.info(f"📈 Already have position in {opportunity.symbol}")
+            return False
+
         # Check daily loss limit
-        portfolio_summary = self.portfolio_manager.get_portfolio_summary()
-        if portfolio_summary["daily_pnl"] < -self.config.system.max_daily_loss:
-            logger.info(
-                f"🛑 Daily loss limit reached: ${portfolio_summary['daily_pnl']:.2f}"
-            )
+        daily_pnl = self.portfolio_manager.daily_pnl
+        if daily_pnl < -self.config.system.max_daily_loss:
+            logger.info(f"🛑 Daily loss limit reached: ${daily_pnl:.2f}")
             return False
 
-        # Check minimum score threshold
-        if opportunity.score < 0.1:
-            logger.info(
-                f"📉 Score too low for {opportunity.symbol}: {opportunity.score:.3f}"
-            )
+        # Check if we have enough capital
+        available_capital = self.portfolio_manager.get_available_capital()
+        if position_size is None:
+            position_size = self.trading_engine.calculate_position_size(opportunity)
+
+        if position_size > available_capital:
+            logger.info(f"💰 Insufficient capital for {opportunity.symbol}")
             return False
 
         return True
 
     async def wait_for_next_trading_day(self):
         """Wait until the next trading day"""
-        now = datetime.now()
-        next_trading_day = self.get_next_trading_day(now)
+        next_trading_day = self.get_next_trading_day(datetime.now())
 
-        wait_seconds = (next_trading_day - now).total_seconds()
+        # Fix the deadline once; the wait re-checks it rather than recomputing
+        deadline = next_trading_day.timestamp()
+        wait_seconds = deadline - time.time()
 
         if wait_seconds > 0:
             logger.info(
                 f"⏰ Waiting {wait_seconds/3600:.1f} hours until next trading day"
             )
-            await asyncio.sleep(wait_seconds)
         else:
             # If it's already past the next trading day, wait 1 hour
             logger.info("⏰ Waiting 1 hour before next cycle")
-            await asyncio.sleep(3600)
+            deadline = time.time() + 3600
+
+        await wait_until(self._shutdown_event, deadline)
 
     def get_next_trading_day(self, current_time: datetime) -> datetime:
         """Get the next trading day (simplified - assumes weekdays)"""
@@ -242,6 +223,7 @@ class TradingAgent:
     async def shutdown(self):
         """Shutdown the trading agent"""
         self.is_running = False
+        self._shutdown_event.set()
         await self.trading_engine.shutdown()
         await self.portfolio_manager.shutdown()
         logger.info("🛑 Trading agent shutdown complete")
@@ -5,15 +5,20 @@ Trading Engine - Executes trades and manages orders
 import asyncio
 import logging
 from datetime import datetime
-from typing import Optional, Dict, Any
-import yfinance as yf
+from typing import Optional, Dict, Any, List
 import random
 
+import numpy as np
+
 from .models.trading_opportunity import TradingOpportunity
 from .config import TradingConfig
+from .prices import get_current_price
 
 logger = logging.getLogger(__name__)
 
+# Simulated slippage is drawn uniformly from +/- this fraction of the price
+_MAX_SLIPPAGE = 0.02
+
 
 class TradingEngine:
     """Trading engine that executes trades"""
@@ -35,16 +40,26 @@ class TradingEngine:
         logger.warning("⚠️  Real trading not implemented yet - using virtual mode")
         self.is_virtual = True
 
-    async def execute_trade(self, opportunity: TradingOpportunity):
+    async def execute_trade(
+        self,
+        opportunity: TradingOpportunity,
+        slippage: Optional[float] = None,
+        position_size: Optional[float] = None,
+    ):
         """Execute a trade based on the opportunity"""
         logger.info(f"💼 Executing trade for {opportunity.symbol}")
 
         if self.is_virtual:
-            await self.execute_virtual_trade(opportunity)
+            await self.execute_virtual_trade(opportunity, slippage, position_size)
         else:
             await self.execute_real_trade(opportunity)
 
-    async def execute_virtual_trade(self, opportunity: TradingOpportunity):
+    async def execute_virtual_trade(
+        self,
+        opportunity: TradingOpportunity,
+        slippage: Optional[float] = None,
+        position_size: Optional[float] = None,
+    ):
         """Execute a virtual trade (paper trading)"""
         try:
             # Get current market price
@@ -56,13 +71,17 @@ class TradingEngine:
                 )
                 return
 
-            # Calculate position size based on risk management
-            position_size = self.calculate_position_size(opportunity)
+            # Calculate position size based on risk management, unless the
+            # caller already sized the whole batch
+            if position_size is None:
+                position_size = self.calculate_position_size(opportunity)
             shares = int(position_size / current_price)
 
             if shares > 0:
                 # Simulate market conditions
-                execution_price = self.simulate_market_conditions(current_price)
+                execution_price = self.simulate_market_conditions(
+                    current_price, slippage
+                )
 
                 # Record the virtual trade
                 trade = {
@@ -109,22 +128,7 @@ class TradingEngine:
 
     async def get_current_price(self, symbol: str) -> float:
         """Get current market price for a symbol"""
-        try:
-            ticker = yf.Ticker(symbol)
-            info = ticker.info
-            current_price = info.get("regularMarketPrice", 0)
-
-            if current_price == 0:
-                # Fallback to historical data
-                hist = ticker.history(period="1d")
-                if not hist.empty:
-                    current_price = hist["Close"].iloc[-1]
-
-            return current_price
-
-        except Exception as e:
-            logger.error(f"❌ Error getting current price for {symbol}: {e}")
-            return 0
+        return await get_current_price(symbol)
 
     def calculate_position_size(self, opportunity: TradingOpportunity) -> float:
         """Calculate position size based on risk management"""
@@ -149,11 +153,35 @@ class TradingEngine:
 
         return position_size
 
-    def simulate_market_conditions(self, base_price: float) -> float:
+    def batch_position_sizes(
+        self, opportunities: List[TradingOpportunity]
+    ) -> List[float]:
+        """calculate_position_size for many opportunities in one NumPy pass"""
+        account_balance = self.config.account_balance
+        risk_amount = account_balance * (self.config.risk_percentage / 100)
+        max_position = account_balance * (self.config.max_position_size / 100)
+
+        risk_score = np.fromiter(
+            (o.risk_score for o in opportunities), float, len(opportunities)
+        )
+        position_size = risk_amount * (1 + (1 - risk_score))
+
+        # Same cap-then-floor order as the scalar version, so $100 wins if the
+        # cap is below it
+        return np.maximum(np.minimum(position_size, max_position), 100).tolist()
+
+    def draw_slippages(self, count: int) -> List[float]:
+        """Pre-draw slippage for up to count trades in one call"""
+        return np.random.uniform(-_MAX_SLIPPAGE, _MAX_SLIPPAGE, count).tolist()
+
+    def simulate_market_conditions(
+        self, base_price: float, slippage: Optional[float] = None
+    ) -> float:
         """Simulate real market conditions like slippage"""
-        # Simulate small price variations
-        variation = random.uniform(-0.02, 0.02)  # ±2% variation
-        execution_price = base_price * (1 + variation)
+        # Simulate small price variations, unless the caller pre-drew one
+        if slippage is None:
+            slippage = random.uniform(-_MAX_SLIPPAGE, _MAX_SLIPPAGE)  # ±2% variation
+        execution_price = base_price * (1 + slippage)
 
         return execution_price
 
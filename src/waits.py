@@ -0,0 +1,28 @@
+"""
+Interruptible sleeps shared by the trading agents
+"""
+
+import asyncio
+import time
+
+# Longest single sleep while waiting for a deadline before re-checking it
+_DEADLINE_RECHECK_SECONDS = 3600.0
+
+
+async def wait_for_event(event: asyncio.Event, timeout: float) -> bool:
+    """Sleep up to timeout seconds; return True early if event gets set"""
+    try:
+        await asyncio.wait_for(event.wait(), timeout=timeout)
+        return True
+    except asyncio.TimeoutError:
+        return False
+
+
+async def wait_until(event: asyncio.Event, deadline: float) -> bool:
+    """Sleep until a wall-clock epoch deadline; True if event ended it early"""
+    # asyncio timeouts run on the monotonic clock, which stops while the
+    # host is suspended, so wake periodically and re-check the wall clock
+    while (remaining := deadline - time.time()) > 0:
+        if await wait_for_event(event, min(remaining, _DEADLINE_RECHECK_SECONDS)):
+            return True
+    return False
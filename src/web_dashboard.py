@@ -3,29 +3,264 @@ Web Dashboard - Real-time monitoring and control interface
 """
 
 import asyncio
+import copy
+import gzip
+import hashlib
 import logging
+import os
+import threading
+import time
 from datetime import datetime
-from typing import Dict, Any, List
-import json
+from pathlib import Path
+from typing import Callable, Dict, Any, List, Optional, Tuple
 import sqlite3
+import orjson
 import yaml
-from fastapi import FastAPI, WebSocket, WebSocketDisconnect
-from fastapi.responses import HTMLResponse
+from fastapi import FastAPI, Request, WebSocket, WebSocketDisconnect
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import HTMLResponse, ORJSONResponse, Response
 import uvicorn
-import pandas as pd
+import numpy as np
+
+from .config import SafeDumper, load_yaml
+from .executor import run_blocking
+
+try:
+    # Optional: brotli shrinks the dashboard page further than gzip
+    import brotli
+except ImportError:
+    brotli = None
 
 logger = logging.getLogger(__name__)
 
+# Front-end assets served by the dashboard. The page is read once, at import
+_STATIC_DIR = Path(__file__).with_name("web_dashboard_static")
+_DASHBOARD_HTML = (_STATIC_DIR / "dashboard.html").read_text(encoding="utf-8")
+
+# Seconds a polled JSON response is reused, so open tabs share one computation
+_RESPONSE_CACHE_TTL = 1.5
+
+# Cache-Control for polled GETs: a tab may reuse a response for two seconds,
+# then revalidates it with If-None-Match. Mutations are never stored
+_API_CACHE_CONTROL = "private, max-age=2"
+_NO_STORE = {"Cache-Control": "no-store"}
+
+# Status updates buffered per WebSocket client; a slow client drops updates
+# once this many are waiting rather than holding up the others
+_CLIENT_QUEUE_SIZE = 4
+
+# orjson options for every payload: NumPy values and arrays as-is, naive
+# datetimes as UTC, and non-string dict keys
+_ORJSON_OPTIONS = (
+    orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NAIVE_UTC | orjson.OPT_NON_STR_KEYS
+)
+
+
+class _JSONResponse(ORJSONResponse):
+    """ORJSONResponse with the dashboard's orjson options"""
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, option=_ORJSON_OPTIONS)
+
+
+# Numeric TradingOpportunity fields sent by /api/opportunities, in order
+_OPPORTUNITY_FIELDS = (
+    "current_price",
+    "score",
+    "risk_score",
+    "potential_return",
+    "technical_score",
+    "sentiment_score",
+    "news_score",
+)
+
+# Read queries, kept as constants so sqlite3's statement cache always hits.
+# Both are served by indexes created alongside their tables.
+_TRADES_SQL = """
+    SELECT symbol, shares, price, total, type, timestamp, opportunity_score, risk_score
+    FROM trades
+    WHERE strategy = ?
+    ORDER BY timestamp DESC
+    LIMIT 20
+"""
+_POSITIONS_SQL = """
+    SELECT symbol, shares, avg_price, current_price, total_value, pnl
+    FROM positions
+    WHERE strategy = ? AND shares > 0
+    ORDER BY total_value DESC
+"""
+
+
+def _dashboard_script() -> bytes:
+    """The minified dashboard script if it is up to date, else the source"""
+    source = _STATIC_DIR / "dashboard.js"
+    minified = _STATIC_DIR / "dashboard.min.js"  # From python -m src.build_assets
+    if minified.exists() and minified.stat().st_mtime >= source.stat().st_mtime:
+        return minified.read_bytes()
+    return source.read_bytes()
+
+
+def _encoded_variants(
+    body: bytes, media_type: str, cache_control: str
+) -> Dict[str, Tuple[str, Response, Response]]:
+    """Build the responses for a static body, once per Content-Encoding
+
+    Returns encoding -> (ETag, 200 response, 304 response). Each encoding
+    gets its own ETag, and the responses are served as-is on every request.
+    """
+    digest = hashlib.md5(body).hexdigest()
+    bodies = {"identity": body, "gzip": gzip.compress(body, 9)}
+    if brotli is not None:
+        bodies["br"] = brotli.compress(body, quality=11)
+
+    variants = {}
+    for encoding, encoded in bodies.items():
+        etag = f'"{digest}"' if encoding == "identity" else f'"{digest}-{encoding}"'
+        headers = {
+            "Cache-Control": cache_control,
+            "ETag": etag,
+            "Vary": "Accept-Encoding",
+        }
+        not_modified = Response(status_code=304, headers=headers)
+        if encoding != "identity":
+            # Already compressed, so GZipMiddleware passes it through
+            headers["Content-Encoding"] = encoding
+        variants[encoding] = (
+            etag,
+            Response(encoded, media_type=media_type, headers=headers),
+            not_modified,
+        )
+    return variants
+
+
+def _accepted_codings(header: str) -> Dict[str, float]:
+    """Parse Accept-Encoding into coding -> q-value"""
+    codings = {}
+    for item in header.split(","):
+        coding, _, params = item.partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        q = 1.0
+        for param in params.split(";"):
+            key, _, value = param.partition("=")
+            if key.strip().lower() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        codings[coding] = q
+    return codings
+
+
+def _etag_matches(etag: str, header: str) -> bool:
+    """Whether an If-None-Match header lists etag (weakly compared) or *"""
+    for candidate in header.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate.removeprefix("W/") == etag:
+            return True
+    return False
+
+
+def _negotiate(
+    variants: Dict[str, Tuple[str, Response, Response]], request: Request
+) -> Response:
+    """Pick the best encoding the client accepts, or 304 if it is up to date"""
+    accept = _accepted_codings(request.headers.get("accept-encoding", ""))
+    wildcard = accept.get("*", 0.0)
+    encoding = next(
+        (e for e in ("br", "gzip") if e in variants and accept.get(e, wildcard) > 0),
+        "identity",
+    )
+    etag, response, not_modified = variants[encoding]
+    if _etag_matches(etag, request.headers.get("if-none-match", "")):
+        return not_modified
+    return response
+
 
 class WebDashboard:
     """Web dashboard for monitoring and controlling the trading agent"""
 
     def __init__(self, trading_agent):
         self.trading_agent = trading_agent
-        self.app = FastAPI()
-        self.active_connections: List[WebSocket] = []
+        # Main database: trades and positions for every strategy
+        database_url = trading_agent.config.system.database_url or ""
+        self._db_path = database_url.replace("sqlite:///", "") or "trading_data.db"
+        # orjson for every JSON route, including trades, positions and status
+        self.app = FastAPI(default_response_class=_JSONResponse)
+        # The dashboard polls several KB of JSON; level 1 is cheap and still
+        # shrinks it several times over
+        self.app.add_middleware(GZipMiddleware, minimum_size=512, compresslevel=1)
+        # Outgoing status queue per connected WebSocket client -> the last
+        # status queued on it, so unchanged ticks send nothing
+        self._clients: Dict[asyncio.Queue, str] = {}
+
+        # The page and its script never change at runtime: encode, compress
+        # and hash them once. The script's URL carries its hash, so browsers
+        # can keep it indefinitely and pick up a new one when it changes
+        script = _dashboard_script()
+        script_name = f"dashboard.{hashlib.md5(script).hexdigest()[:16]}.js"
+        self._static_files = {
+            script_name: _encoded_variants(
+                script,
+                "text/javascript",
+                "public, max-age=31536000, immutable",
+            )
+        }
+        html = self.get_dashboard_html().replace(
+            "__DASHBOARD_JS__", f"/static/{script_name}"
+        )
+        # The page itself is always revalidated (a 304 via its ETag): only the
+        # current script hash is served, so a stale page would load no script
+        self._dashboard_variants = _encoded_variants(
+            html.encode("utf-8"), "text/html", "no-cache"
+        )
+
+        # Read connections kept open across requests, keyed by database path
+        self._conns: Dict[str, sqlite3.Connection] = {}
+        self._conns_lock = threading.Lock()
+
+        # Serialized responses for the polled endpoints:
+        # key -> (monotonic, JSON, ETag)
+        self._response_cache: Dict[str, Tuple[float, bytes, str]] = {}
+
+        # Per-strategy /api/strategies entries, rebuilt only when their inputs
+        # change: name -> ((portfolio version, is_active, opportunities), info)
+        self._strategy_cache: Dict[str, Tuple[tuple, Dict[str, Any]]] = {}
+
+        # One task serializes the status and sends it to every WebSocket client
+        self._broadcast_task: Optional[asyncio.Task] = None
+
+        # config.yaml as parsed on first balance change; later changes edit it
+        # in memory, mark it dirty, and a single flusher task writes it back
+        self._config_yaml: Optional[Dict[str, Any]] = None
+        self._config_dirty = False
+        self._config_flush_task: Optional[asyncio.Task] = None
+
+        # The running uvicorn server, so stop() can ask it to exit
+        self._server: Optional[uvicorn.Server] = None
+
         self.setup_routes()
 
+    def _get_conn(self, db_path: str) -> sqlite3.Connection:
+        """Return the shared connection for db_path, opening it on first use"""
+        with self._conns_lock:
+            conn = self._conns.get(db_path)
+            if conn is None:
+                conn = sqlite3.connect(db_path, check_same_thread=False)
+                conn.row_factory = sqlite3.Row  # Rows map column name -> value
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.execute("PRAGMA synchronous=NORMAL")
+                conn.execute("PRAGMA cache_size=-8000")
+                self._conns[db_path] = conn
+            return conn
+
+    def _query(self, db_path: str, sql: str, params: tuple = ()) -> List[sqlite3.Row]:
+        """Run a read query on the shared connection for db_path"""
+        conn = self._get_conn(db_path)
+        with self._conns_lock:
+            return conn.execute(sql, params).fetchall()
+
     def setup_routes(self):
         """Setup API routes"""
 
@@ -34,709 +269,534 @@ class WebDashboard:
             """Health check endpoint for Render"""
             return {"status": "healthy", "message": "Trading agent is running"}
 
-        @self.app.get("/")
-        async def get_dashboard():
-            return HTMLResponse(self.get_dashboard_html())
+        @self.app.get("/", response_class=HTMLResponse)
+        async def get_dashboard(request: Request):
+            return _negotiate(self._dashboard_variants, request)
+
+        @self.app.get("/static/{filename}")
+        async def get_static(filename: str, request: Request):
+            variants = self._static_files.get(filename)
+            if variants is None:
+                return Response(status_code=404)
+            return _negotiate(variants, request)
 
         @self.app.websocket("/ws")
         async def websocket_endpoint(websocket: WebSocket):
             await websocket.accept()
-            self.active_connections.append(websocket)
-            logger.info("connection open")
+            logger.debug("connection open")
+
+            # First update right away; _broadcast_status queues the rest
+            queue: asyncio.Queue = asyncio.Queue(maxsize=_CLIENT_QUEUE_SIZE)
+            text = self._status_text()
+            queue.put_nowait(text)
+            self._clients[queue] = text
+            writer = asyncio.create_task(self._send_updates(websocket, queue))
+            if self._broadcast_task is None or self._broadcast_task.done():
+                self._broadcast_task = asyncio.create_task(self._broadcast_status())
 
             try:
+                # The page sends its set-balance/reset calls over the socket
                 while True:
-                    # Send status updates every 5 seconds
-                    status = self.trading_agent.get_status()
-                    await websocket.send_text(json.dumps(status))
-                    await asyncio.sleep(5)
+                    await self._handle_rpc(websocket, await websocket.receive_text())
             except WebSocketDisconnect:
-                self.active_connections.remove(websocket)
-                logger.info("connection closed")
+                logger.debug("connection closed")
+            finally:
+                self._clients.pop(queue, None)
+                writer.cancel()
 
         @self.app.get("/api/status")
-        async def get_status():
-            return self.trading_agent.get_status()
+        async def get_status(request: Request):
+            return self._cached_response(
+                "status", self.trading_agent.get_status, request
+            )
 
         @self.app.get("/api/strategies")
-        async def get_strategies():
+        async def get_strategies(request: Request):
             """Get detailed information about all strategies"""
-            try:
-                strategies_info = {}
-
-                # Check for failed strategies
-                if (
-                    hasattr(self.trading_agent, "strategies_failed")
-                    and self.trading_agent.strategies_failed
-                ):
-                    logger.critical(
-                        "❌ No strategies loaded in agent. Returning error to dashboard."
-                    )
-                    return {
-                        "error": "No strategies loaded! Check your config.yaml under 'strategies:' and for errors in the logs."
-                    }
-
-                # Debug logging
-                logger.info(
-                    f"Number of strategies: {len(self.trading_agent.strategies)}"
-                )
-                logger.info(
-                    f"Strategy keys: {list(self.trading_agent.strategies.keys())}"
-                )
-                logger.info(f"Trading agent type: {type(self.trading_agent)}")
-                logger.info(f"Strategies type: {type(self.trading_agent.strategies)}")
-
-                # Check if we have any strategies
-                if not self.trading_agent.strategies:
-                    logger.warning("No strategies available in trading agent")
-                    return {
-                        "error": "No strategies available! Check your config.yaml under 'strategies:' and for errors in the logs."
-                    }
-
-                for (
-                    strategy_name,
-                    strategy_data,
-                ) in self.trading_agent.strategies.items():
-                    logger.info(f"Processing strategy: {strategy_name}")
-                    logger.info(f"Strategy data keys: {list(strategy_data.keys())}")
-                    try:
-                        portfolio_manager = strategy_data["portfolio_manager"]
-                        portfolio_summary = portfolio_manager.get_portfolio_summary()
-
-                        strategies_info[strategy_name] = {
-                            "name": (
-                                strategy_data["config"].trading.name
-                                if hasattr(strategy_data["config"].trading, "name")
-                                else strategy_name
-                            ),
-                            "description": (
-                                strategy_data["config"].trading.description
-                                if hasattr(
-                                    strategy_data["config"].trading, "description"
-                                )
-                                else ""
-                            ),
-                            "is_active": strategy_data["is_active"],
-                            "account_balance": portfolio_summary["account_balance"],
-                            "total_pnl": portfolio_summary["total_pnl"],
-                            "daily_pnl": portfolio_summary["daily_pnl"],
-                            "positions_count": portfolio_summary["positions_count"],
-                            "trades_today": portfolio_summary["trades_today"],
-                            "opportunities_count": len(
-                                strategy_data["daily_opportunities"]
-                            ),
-                            "risk_percentage": strategy_data[
-                                "config"
-                            ].trading.risk_percentage,
-                            "max_position_size": strategy_data[
-                                "config"
-                            ].trading.max_position_size,
-                            "max_daily_trades": strategy_data[
-                                "config"
-                            ].system.max_daily_trades,
-                            "max_daily_loss": strategy_data[
-                                "config"
-                            ].system.max_daily_loss,
-                        }
-                        logger.info(f"Successfully processed strategy: {strategy_name}")
-                    except Exception as e:
-                        logger.error(f"Error processing strategy {strategy_name}: {e}")
-                        strategies_info[strategy_name] = {"error": str(e)}
-
-                logger.info(f"Returning {len(strategies_info)} strategies")
-                return strategies_info
-            except Exception as e:
-                logger.error(f"Error getting strategies: {e}")
-                return {"error": str(e)}
+            return self._cached_response(
+                "strategies", self._compute_strategies, request
+            )
 
         @self.app.get("/api/trades/{strategy_name}")
-        async def get_trades(strategy_name: str):
+        async def get_trades(strategy_name: str, request: Request):
             """Get recent trades for a specific strategy"""
             try:
-                # Use main database instead of strategy-specific database
-                db_path = self.trading_agent.config.system.database_url.replace(
-                    "sqlite:///", ""
-                )
-                if not db_path:
-                    db_path = "trading_data.db"
-
-                conn = sqlite3.connect(db_path)
-                cursor = conn.cursor()
-
-                cursor.execute(
-                    """
-                    SELECT symbol, shares, price, total, type, timestamp, opportunity_score, risk_score
-                    FROM trades 
-                    WHERE strategy = ?
-                    ORDER BY timestamp DESC 
-                    LIMIT 20
-                    """,
-                    (strategy_name,),
+                if strategy_name not in self.trading_agent.strategies:
+                    return []  # Keeps unknown names out of the response cache
+
+                return self._cached_response(
+                    f"trades:{strategy_name}",
+                    lambda: [
+                        dict(row)
+                        for row in self._query(
+                            self._db_path, _TRADES_SQL, (strategy_name,)
+                        )
+                    ],
+                    request,
                 )
 
-                trades = []
-                for row in cursor.fetchall():
-                    trades.append(
-                        {
-                            "symbol": row[0],
-                            "shares": row[1],
-                            "price": row[2],
-                            "total": row[3],
-                            "type": row[4],
-                            "timestamp": row[5],
-                            "opportunity_score": row[6],
-                            "risk_score": row[7],
-                        }
-                    )
-
-                conn.close()
-                return trades
-
             except Exception as e:
-                logger.error(f"Error getting trades for {strategy_name}: {e}")
+                logger.error("Error getting trades for %s: %s", strategy_name, e)
                 return []
 
         @self.app.get("/api/positions/{strategy_name}")
-        async def get_positions(strategy_name: str):
+        async def get_positions(strategy_name: str, request: Request):
             """Get current positions for a specific strategy"""
             try:
-                conn = sqlite3.connect(f"trading_data_{strategy_name}.db")
-                cursor = conn.cursor()
-
-                cursor.execute(
-                    """
-                    SELECT symbol, shares, avg_price, current_price, total_value, pnl 
-                    FROM positions 
-                    WHERE shares > 0
-                    ORDER BY total_value DESC
-                    """
+                if strategy_name not in self.trading_agent.strategies:
+                    return []
+
+                return self._cached_response(
+                    f"positions:{strategy_name}",
+                    lambda: [
+                        dict(row)
+                        for row in self._query(
+                            self._db_path, _POSITIONS_SQL, (strategy_name,)
+                        )
+                    ],
+                    request,
                 )
 
-                positions = []
-                for row in cursor.fetchall():
-                    positions.append(
-                        {
-                            "symbol": row[0],
-                            "shares": row[1],
-                            "avg_price": row[2],
-                            "current_price": row[3],
-                            "total_value": row[4],
-                            "pnl": row[5],
-                        }
-                    )
-
-                conn.close()
-                return positions
-
             except Exception as e:
-                logger.error(f"Error getting positions for {strategy_name}: {e}")
+                logger.error("Error getting positions for %s: %s", strategy_name, e)
                 return []
 
         @self.app.get("/api/opportunities")
-        async def get_opportunities():
+        async def get_opportunities(request: Request):
             """Get current trading opportunities and recent research data"""
-            try:
-                opportunities = []
+            return self._cached_response(
+                "opportunities", self._compute_opportunities, request
+            )
 
-                # Check if we have any strategies
-                if not self.trading_agent.strategies:
-                    return {"error": "No strategies available"}
+        @self.app.get("/api/bootstrap")
+        async def get_bootstrap(request: Request):
+            """Status, strategies and opportunities in one response for page load"""
+            return self._cached_response("bootstrap", self._compute_bootstrap, request)
 
-                # Get opportunities from the first strategy (shared research)
-                first_strategy = list(self.trading_agent.strategies.values())[0]
+        @self.app.post("/api/set-balance/{strategy_name}")
+        async def set_strategy_balance(strategy_name: str, request: dict):
+            """Set a new account balance for a specific strategy"""
+            result = await self._set_balance(
+                strategy_name, request.get("balance", 10000.0)
+            )
+            return _JSONResponse(result, headers=_NO_STORE)
 
-                # First, try to get current opportunities
-                if first_strategy["daily_opportunities"]:
-                    for opp in first_strategy["daily_opportunities"][:10]:
-                        # Handle NaN values for JSON serialization
-                        opportunities.append(
-                            {
-                                "symbol": opp.symbol,
-                                "current_price": (
-                                    float(opp.current_price)
-                                    if not pd.isna(opp.current_price)
-                                    else 0.0
-                                ),
-                                "score": (
-                                    float(opp.score) if not pd.isna(opp.score) else 0.0
-                                ),
-                                "risk_score": (
-                                    float(opp.risk_score)
-                                    if not pd.isna(opp.risk_score)
-                                    else 0.0
-                                ),
-                                "potential_return": (
-                                    float(opp.potential_return)
-                                    if not pd.isna(opp.potential_return)
-                                    else 0.0
-                                ),
-                                "technical_score": (
-                                    float(opp.technical_score)
-                                    if not pd.isna(opp.technical_score)
-                                    else 0.0
-                                ),
-                                "sentiment_score": (
-                                    float(opp.sentiment_score)
-                                    if not pd.isna(opp.sentiment_score)
-                                    else 0.0
-                                ),
-                                "news_score": (
-                                    float(opp.news_score)
-                                    if not pd.isna(opp.news_score)
-                                    else 0.0
-                                ),
-                                "type": "opportunity",
-                            }
-                        )
+        @self.app.post("/api/reset/{strategy_name}")
+        async def reset_strategy(strategy_name: str):
+            """Reset a specific strategy's portfolio"""
+            return _JSONResponse(
+                await self._reset_strategy(strategy_name), headers=_NO_STORE
+            )
 
-                # If no current opportunities, get recent trades from all strategies
-                if not opportunities:
-                    # Use main database instead of strategy-specific databases
-                    db_path = self.trading_agent.config.system.database_url.replace(
-                        "sqlite:///", ""
-                    )
-                    if not db_path:
-                        db_path = "trading_data.db"
-
-                    try:
-                        conn = sqlite3.connect(db_path)
-                        cursor = conn.cursor()
-
-                        cursor.execute(
-                            """
-                            SELECT symbol, shares, price, total, type, timestamp, opportunity_score, risk_score, strategy
-                            FROM trades 
-                            ORDER BY timestamp DESC 
-                            LIMIT 15
-                            """
-                        )
+        @self.app.get("/api/version")
+        async def get_version():
+            """Get the current version of the application"""
+            return {"version": "2.0.0", "deployment": "railway-fixed"}
 
-                        for row in cursor.fetchall():
-                            opportunities.append(
-                                {
-                                    "symbol": row[0],
-                                    "shares": row[1],
-                                    "price": row[2],
-                                    "total": row[3],
-                                    "type": row[4],
-                                    "timestamp": row[5],
-                                    "score": row[6] if row[6] else 0.0,
-                                    "risk_score": row[7] if row[7] else 0.0,
-                                    "strategy": row[8],
-                                    "type": "recent_trade",
-                                }
-                            )
-
-                        conn.close()
-                    except Exception as e:
-                        logger.error(f"Error getting trades from main database: {e}")
-                        # Add placeholder opportunities for each strategy
-                        for strategy_name in self.trading_agent.strategies.keys():
-                            opportunities.append(
-                                {
-                                    "symbol": "N/A",
-                                    "shares": 0,
-                                    "price": 0.0,
-                                    "total": 0.0,
-                                    "type": "No trades yet",
-                                    "timestamp": "New deployment",
-                                    "score": 0.0,
-                                    "risk_score": 0.0,
-                                    "strategy": strategy_name,
-                                    "type": "info",
-                                    "message": f"{strategy_name} strategy is running but no trades yet. Database will be created on first trade.",
-                                }
-                            )
-
-                # If still no data, return a message
-                if not opportunities:
-                    return [
-                        {
-                            "symbol": "No opportunities",
-                            "message": "No current opportunities available. Trading cycle completed. Check back after the next research cycle.",
-                            "type": "info",
-                        }
-                    ]
+    async def _set_balance(
+        self, strategy_name: str, balance: float = 10000.0
+    ) -> Dict[str, Any]:
+        """Set a new account balance for a specific strategy"""
+        try:
+            new_balance = balance
 
-                return opportunities
-            except Exception as e:
-                logger.error(f"Error getting opportunities: {e}")
-                return {"error": str(e)}
+            # Update the config file
+            if self._config_yaml is None:
+                self._config_yaml = await run_blocking(self._read_config_sync)
+            config = self._config_yaml
 
-        @self.app.post("/api/set-balance/{strategy_name}")
-        async def set_strategy_balance(strategy_name: str, request: dict):
-            """Set a new account balance for a specific strategy"""
-            try:
-                new_balance = request.get("balance", 10000.0)
+            if "strategies" in config and strategy_name in config["strategies"]:
+                config["strategies"][strategy_name]["account_balance"] = float(
+                    new_balance
+                )
+                self._config_dirty = True
+                if self._config_flush_task is None or self._config_flush_task.done():
+                    self._config_flush_task = asyncio.create_task(self._flush_config())
 
-                # Update the config file
-                with open("config.yaml", "r") as f:
-                    config = yaml.safe_load(f)
+                # Update the strategy's portfolio manager
+                strategy_data = self.trading_agent.strategies[strategy_name]
+                strategy_data["portfolio_manager"].set_account_balance(
+                    float(new_balance)
+                )
+                self._response_cache.clear()
+                self._push_status()
 
-                if "strategies" in config and strategy_name in config["strategies"]:
-                    config["strategies"][strategy_name]["account_balance"] = float(
-                        new_balance
-                    )
+                return {
+                    "message": f"Balance updated for {strategy_name}",
+                    "new_balance": float(new_balance),
+                }
+            else:
+                return {"error": f"Strategy {strategy_name} not found"}
 
-                    with open("config.yaml", "w") as f:
-                        yaml.dump(config, f, default_flow_style=False)
+        except Exception as e:
+            logger.error("Error setting balance for %s: %s", strategy_name, e)
+            return {"error": str(e)}
 
-                    # Update the strategy's portfolio manager
-                    strategy_data = self.trading_agent.strategies[strategy_name]
-                    strategy_data["portfolio_manager"].account_balance = float(
-                        new_balance
-                    )
+    async def _reset_strategy(self, strategy_name: str) -> Dict[str, Any]:
+        """Reset a specific strategy's portfolio"""
+        try:
+            # Reset the strategy's portfolio manager and its database.
+            # The manager keeps its connection open, so the tables are
+            # cleared in place rather than deleting the database file.
+            strategy_data = self.trading_agent.strategies[strategy_name]
+            config = strategy_data["config"]
+
+            await strategy_data["portfolio_manager"].reset(
+                config.trading.account_balance
+            )
+            self._response_cache.clear()
+            self._push_status()
 
-                    return {
-                        "message": f"Balance updated for {strategy_name}",
-                        "new_balance": float(new_balance),
-                    }
-                else:
-                    return {"error": f"Strategy {strategy_name} not found"}
+            return {
+                "message": f"Strategy {strategy_name} reset successfully",
+                "new_balance": config.trading.account_balance,
+            }
 
-            except Exception as e:
-                logger.error(f"Error setting balance for {strategy_name}: {e}")
-                return {"error": str(e)}
+        except Exception as e:
+            logger.error("Error resetting %s: %s", strategy_name, e)
+            return {"error": str(e)}
 
-        @self.app.post("/api/reset/{strategy_name}")
-        async def reset_strategy(strategy_name: str):
-            """Reset a specific strategy's portfolio"""
+    async def _handle_rpc(self, websocket: WebSocket, text: str):
+        """Answer an {id, method, params} request sent by the page over /ws"""
+        try:
+            request = orjson.loads(text)
+            request_id = request["id"]
+        except Exception as e:
+            # Without an id there is no call on the page to answer
+            logger.debug("Bad WebSocket request %r: %s", text[:100], e)
+            return
+
+        try:
+            method = request.get("method")
+            handler = {
+                "set_balance": self._set_balance,
+                "reset": self._reset_strategy,
+            }.get(method)
+            if handler is None:
+                raise ValueError(f"Unknown method: {method}")
+            reply = {
+                "id": request_id,
+                "result": await handler(**request.get("params", {})),
+            }
+        except Exception as e:
+            logger.debug("Failed WebSocket request %r: %s", text[:100], e)
+            reply = {"id": request_id, "error": str(e)}
+        await websocket.send_text(orjson.dumps(reply, option=_ORJSON_OPTIONS).decode())
+
+    def _status_text(self) -> str:
+        """Agent status plus opportunities as a JSON string for WebSocket clients"""
+        status = self.trading_agent.get_status()
+        # Sent with the status so pages don't poll /api/opportunities per tick
+        status["opportunities"] = self._compute_opportunities()
+        return orjson.dumps(status, option=_ORJSON_OPTIONS).decode()
+
+    async def _broadcast_status(self):
+        """Queue a status update for every WebSocket client every 5 seconds"""
+        while True:
+            await asyncio.sleep(5)
+            if not self._clients:
+                break  # Restarted by the next client to connect
+
+            self._push_status()
+
+    def _push_status(self):
+        """Queue the current status for every client that hasn't seen it"""
+        # Serialize once, however many clients are connected, and push
+        # only to clients whose last queued status differs
+        text = self._status_text()
+        for queue, last in list(self._clients.items()):
+            if last == text or queue not in self._clients:
+                continue
             try:
-                import os
+                queue.put_nowait(text)
+                self._clients[queue] = text
+            except asyncio.QueueFull:
+                pass  # Client is behind; it gets the next tick instead
 
-                # Delete the strategy's database file
-                db_file = f"trading_data_{strategy_name}.db"
-                if os.path.exists(db_file):
-                    os.remove(db_file)
+    async def _send_updates(self, websocket: WebSocket, queue: asyncio.Queue):
+        """Write one client's queued status updates to its socket"""
+        try:
+            while True:
+                await websocket.send_text(await queue.get())
+        except Exception as e:
+            # The receive loop in websocket_endpoint sees the disconnect
+            logger.debug("WebSocket send stopped: %s", e)
+
+    def _read_config_sync(self) -> Dict[str, Any]:
+        """Parse config.yaml"""
+        return load_yaml("config.yaml")
+
+    def _write_config_sync(self, config: Dict[str, Any]):
+        """Write a config snapshot to config.yaml"""
+        # Written aside and renamed, so the file is never left half-written
+        tmp_path = "config.yaml.tmp"
+        with open(tmp_path, "w") as f:
+            yaml.dump(config, f, Dumper=SafeDumper, default_flow_style=False)
+        os.replace(tmp_path, "config.yaml")
+
+    async def _flush_config(self):
+        """Persist config.yaml off the event loop until no change is pending"""
+        while self._config_dirty:
+            self._config_dirty = False
+            # Snapshot on the loop; the worker must not read the live dict
+            snapshot = copy.deepcopy(self._config_yaml)
+            try:
+                await run_blocking(self._write_config_sync, snapshot)
+            except Exception as e:
+                logger.error("Error writing config.yaml: %s", e)
 
-                # Reset the strategy's portfolio manager
-                strategy_data = self.trading_agent.strategies[strategy_name]
-                config = strategy_data["config"]
+    def _cached_response(
+        self, key: str, compute: Callable[[], Any], request: Request
+    ) -> Response:
+        """Serve compute()'s JSON from a short-lived cache shared by all clients
 
-                strategy_data["portfolio_manager"].account_balance = (
-                    config.trading.account_balance
+        Pollers that send back the ETag get an empty 304 while nothing changed.
+        """
+        now = time.monotonic()
+        entry = self._response_cache.get(key)
+        if entry is None or now - entry[0] >= _RESPONSE_CACHE_TTL:
+            payload = orjson.dumps(compute(), option=_ORJSON_OPTIONS)
+            entry = (now, payload, f'"{hashlib.md5(payload).hexdigest()}"')
+            self._response_cache[key] = entry
+
+        headers = {"ETag": entry[2], "Cache-Control": _API_CACHE_CONTROL}
+        if _etag_matches(entry[2], request.headers.get("if-none-match", "")):
+            return Response(status_code=304, headers=headers)
+        return Response(entry[1], media_type="application/json", headers=headers)
+
+    def _compute_bootstrap(self) -> Dict[str, Any]:
+        """Everything the dashboard page needs to render its first frame"""
+        return {
+            "status": self.trading_agent.get_status(),
+            "strategies": self._compute_strategies(),
+            "opportunities": self._compute_opportunities(),
+        }
+
+    def _compute_strategies(self) -> Any:
+        """Get detailed information about all strategies"""
+        try:
+            strategies_info = {}
+
+            # Check for failed strategies
+            if (
+                hasattr(self.trading_agent, "strategies_failed")
+                and self.trading_agent.strategies_failed
+            ):
+                logger.critical(
+                    "❌ No strategies loaded in agent. Returning error to dashboard."
                 )
-                strategy_data["portfolio_manager"].positions = {}
-                strategy_data["portfolio_manager"].total_pnl = 0.0
-                strategy_data["portfolio_manager"].daily_pnl = 0.0
-                strategy_data["portfolio_manager"].trades_today = 0
+                return {
+                    "error": "No strategies loaded! Check your config.yaml under 'strategies:' and for errors in the logs."
+                }
 
+            # Debug logging
+            # Debug only: this runs on every dashboard poll
+            debug = logger.isEnabledFor(logging.DEBUG)
+            if debug:
+                logger.debug(
+                    "Number of strategies: %d", len(self.trading_agent.strategies)
+                )
+                logger.debug(
+                    "Strategy keys: %s", list(self.trading_agent.strategies.keys())
+                )
+                logger.debug("Trading agent type: %s", type(self.trading_agent))
+                logger.debug("Strategies type: %s", type(self.trading_agent.strategies))
+
+            # Check if we have any strategies
+            if not self.trading_agent.strategies:
+                logger.warning("No strategies available in trading agent")
                 return {
-                    "message": f"Strategy {strategy_name} reset successfully",
-                    "new_balance": config.trading.account_balance,
+                    "error": "No strategies available! Check your config.yaml under 'strategies:' and for errors in the logs."
                 }
 
-            except Exception as e:
-                logger.error(f"Error resetting {strategy_name}: {e}")
-                return {"error": str(e)}
+            for (
+                strategy_name,
+                strategy_data,
+            ) in self.trading_agent.strategies.items():
+                if debug:
+                    logger.debug("Processing strategy: %s", strategy_name)
+                    logger.debug("Strategy data keys: %s", list(strategy_data.keys()))
+                try:
+                    portfolio_manager = strategy_data["portfolio_manager"]
+                    key = (
+                        portfolio_manager.version,
+                        strategy_data["is_active"],
+                        len(strategy_data["daily_opportunities"]),
+                    )
+                    cached = self._strategy_cache.get(strategy_name)
+                    if cached is not None and cached[0] == key:
+                        strategies_info[strategy_name] = cached[1]
+                        continue
+
+                    portfolio_summary = portfolio_manager.get_portfolio_summary()
+                    strategies_info[strategy_name] = {
+                        **strategy_data["static_meta"],
+                        "is_active": strategy_data["is_active"],
+                        "account_balance": portfolio_summary["account_balance"],
+                        "total_pnl": portfolio_summary["total_pnl"],
+                        "daily_pnl": portfolio_summary["daily_pnl"],
+                        "positions_count": portfolio_summary["positions_count"],
+                        "trades_today": portfolio_summary["trades_today"],
+                        "opportunities_count": len(
+                            strategy_data["daily_opportunities"]
+                        ),
+                    }
+                    self._strategy_cache[strategy_name] = (
+                        key,
+                        strategies_info[strategy_name],
+                    )
+                    logger.debug("Successfully processed strategy: %s", strategy_name)
+                except Exception as e:
+                    logger.error("Error processing strategy %s: %s", strategy_name, e)
+                    strategies_info[strategy_name] = {"error": str(e)}
 
-        @self.app.get("/api/version")
-        async def get_version():
-            """Get the current version of the application"""
-            return {"version": "2.0.0", "deployment": "railway-fixed"}
+            logger.debug("Returning %d strategies", len(strategies_info))
+            return strategies_info
+        except Exception as e:
+            logger.error("Error getting strategies: %s", e)
+            return {"error": str(e)}
 
-    def get_dashboard_html(self) -> str:
-        return """
-        <!DOCTYPE html>
-        <html>
-        <head>
-            <title>Multi-Strategy Stock Market Trading Agent</title>
-            <meta charset="UTF-8">
-            <meta name="viewport" content="width=device-width, initial-scale=1.0">
-            <style>
-                body { font-family: Arial, sans-serif; background: #f8f9fa; color: #222; margin: 0; padding: 0; }
-                #container { max-width: 1400px; margin: 40px auto; background: #fff; border-radius: 8px; box-shadow: 0 2px 8px #0001; padding: 32px; }
-                h1 { color: #2c3e50; text-align: center; margin-bottom: 32px; }
-                .strategies-grid { display: grid; grid-template-columns: repeat(auto-fit, minmax(400px, 1fr)); gap: 24px; margin-bottom: 32px; }
-                .strategy-card { background: #fff; border: 2px solid #e9ecef; border-radius: 8px; padding: 20px; box-shadow: 0 2px 4px #0001; }
-                .strategy-card.turbo { border-color: #dc3545; }
-                .strategy-card.moderate { border-color: #28a745; }
-                .strategy-card.risky { border-color: #ffc107; }
-                .strategy-header { display: flex; justify-content: space-between; align-items: center; margin-bottom: 16px; }
-                .strategy-name { font-size: 1.2em; font-weight: bold; }
-                .strategy-status { padding: 4px 8px; border-radius: 4px; font-size: 0.8em; }
-                .status-active { background: #d4edda; color: #155724; }
-                .status-inactive { background: #f8d7da; color: #721c24; }
-                .metrics { display: grid; grid-template-columns: repeat(2, 1fr); gap: 12px; margin-bottom: 16px; }
-                .metric { background: #f8f9fa; padding: 8px; border-radius: 4px; }
-                .metric-label { font-size: 0.8em; color: #666; }
-                .metric-value { font-size: 1.1em; font-weight: bold; }
-                .positive { color: #28a745; }
-                .negative { color: #dc3545; }
-                .controls { display: flex; gap: 8px; margin-top: 16px; }
-                .btn { padding: 8px 16px; border: none; border-radius: 4px; cursor: pointer; font-size: 0.9em; }
-                .btn-primary { background: #007bff; color: white; }
-                .btn-success { background: #28a745; color: white; }
-                .btn-danger { background: #dc3545; color: white; }
-                .btn-warning { background: #ffc107; color: #212529; }
-                .opportunities { margin-top: 24px; }
-                .opportunities h3 { color: #2c3e50; margin-bottom: 16px; }
-                .opportunity-list { background: #f8f9fa; padding: 16px; border-radius: 4px; }
-                .opportunity-item { display: flex; justify-content: space-between; padding: 8px 0; border-bottom: 1px solid #dee2e6; }
-                .opportunity-item:last-child { border-bottom: none; }
-                .no-opportunities { text-align: center; color: #666; font-style: italic; }
-                .error-message { color: #dc3545; background: #f8d7da; border: 1px solid #dc3545; padding: 16px; border-radius: 8px; margin-bottom: 24px; text-align: center; font-weight: bold; }
-                .links { margin-top: 24px; text-align: center; }
-                .links a { display: inline-block; margin: 8px 16px 8px 0; padding: 8px 16px; background: #007bff; color: white; text-decoration: none; border-radius: 4px; }
-                .links a:hover { background: #0056b3; }
-            </style>
-        </head>
-        <body>
-            <div id="container">
-                <h1>🚀 Multi-Strategy Stock Market Trading Agent</h1>
-                <div id="error-message" class="error-message" style="display:none;"></div>
-                <div id="strategies" class="strategies-grid">
-                    <!-- Strategy cards will be populated here -->
-                </div>
-                
-                <div class="opportunities">
-                    <h3>🎯 Current Trading Opportunities</h3>
-                    <div id="opportunities" class="opportunity-list">
-                        Loading opportunities...
-                    </div>
-                </div>
-                
-                <div class="links">
-                    <a href="/api/opportunities" target="_blank">🎯 View All Opportunities</a>
-                    <a href="/api/strategies" target="_blank">📊 View Strategy Details</a>
-                </div>
-            </div>
-
-            <script>
-                let ws = null;
-                
-                function connectWebSocket() {
-                    ws = new WebSocket('ws://localhost:8000/ws');
-                    
-                    ws.onopen = function() {
-                        console.log('WebSocket connected');
-                    };
-                    
-                    ws.onmessage = function(event) {
-                        const data = JSON.parse(event.data);
-                        updateDashboard(data);
-                    };
-                    
-                    ws.onclose = function() {
-                        console.log('WebSocket disconnected, reconnecting...');
-                        setTimeout(connectWebSocket, 5000);
-                    };
-                }
-                
-                async function fetchStrategies() {
-                    try {
-                        const response = await fetch('/api/strategies');
-                        const data = await response.json();
-                        if (data.error) {
-                            document.getElementById('error-message').innerText = data.error;
-                            document.getElementById('error-message').style.display = 'block';
-                            document.getElementById('strategies').style.display = 'none';
-                        } else {
-                            document.getElementById('error-message').style.display = 'none';
-                            document.getElementById('strategies').style.display = 'grid';
+    def _compute_opportunities(self) -> Any:
+        """Get current trading opportunities and recent research data"""
+        try:
+            opportunities = []
+
+            # Check if we have any strategies
+            if not self.trading_agent.strategies:
+                return {"error": "No strategies available"}
+
+            # Get opportunities from the first strategy (shared research)
+            first_strategy = next(iter(self.trading_agent.strategies.values()))
+
+            # First, try to get current opportunities
+            if first_strategy["daily_opportunities"]:
+                opps = first_strategy["daily_opportunities"][:10]
+
+                # Handle NaN values for JSON serialization, all fields at once
+                rows = np.array(
+                    [[getattr(opp, f) for f in _OPPORTUNITY_FIELDS] for opp in opps],
+                    dtype=np.float64,
+                )
+                rows[np.isnan(rows)] = 0.0
+
+                for opp, row in zip(opps, rows.tolist()):
+                    item = dict(zip(_OPPORTUNITY_FIELDS, row))
+                    opportunities.append(
+                        {
+                            "symbol": opp.symbol,
+                            **item,
+                            # Display strings, formatted once per cached response
+                            # rather than on every client for every push
+                            "price_str": f"{item['current_price']:.2f}",
+                            "score_str": f"{item['score']:.3f}",
+                            "risk_str": f"{item['risk_score']:.3f}",
+                            "type": "opportunity",
                         }
-                    } catch (e) {
-                        document.getElementById('error-message').innerText = 'Error loading strategies: ' + e;
-                        document.getElementById('error-message').style.display = 'block';
-                        document.getElementById('strategies').style.display = 'none';
-                    }
-                }
-                
-                function updateDashboard(data) {
-                    updateStrategies(data.strategies);
-                    updateOpportunities(data.strategies);
-                }
-                
-                function updateStrategies(strategies) {
-                    const container = document.getElementById('strategies');
-                    container.innerHTML = '';
-                    
-                    for (const [strategyName, strategy] of Object.entries(strategies)) {
-                        const card = createStrategyCard(strategyName, strategy);
-                        container.appendChild(card);
-                    }
-                }
-                
-                function createStrategyCard(strategyName, strategy) {
-                    const card = document.createElement('div');
-                    card.className = `strategy-card ${strategyName}`;
-                    
-                    const isActive = strategy.is_active;
-                    const statusClass = isActive ? 'status-active' : 'status-inactive';
-                    const statusText = isActive ? 'ACTIVE' : 'INACTIVE';
-                    
-                    const pnlClass = strategy.daily_pnl >= 0 ? 'positive' : 'negative';
-                    const pnlSign = strategy.daily_pnl >= 0 ? '+' : '';
-                    
-                    card.innerHTML = `
-                        <div class="strategy-header">
-                            <div class="strategy-name">${strategy.name || strategyName.toUpperCase()}</div>
-                            <div class="strategy-status ${statusClass}">${statusText}</div>
-                        </div>
-                        
-                        <div class="metrics">
-                            <div class="metric">
-                                <div class="metric-label">Account Balance</div>
-                                <div class="metric-value">$${strategy.account_balance.toFixed(2)}</div>
-                            </div>
-                            <div class="metric">
-                                <div class="metric-label">Daily P&L</div>
-                                <div class="metric-value ${pnlClass}">${pnlSign}$${strategy.daily_pnl.toFixed(2)}</div>
-                            </div>
-                            <div class="metric">
-                                <div class="metric-label">Total P&L</div>
-                                <div class="metric-value ${pnlClass}">${pnlSign}$${strategy.total_pnl.toFixed(2)}</div>
-                            </div>
-                            <div class="metric">
-                                <div class="metric-label">Positions</div>
-                                <div class="metric-value">${strategy.positions_count}</div>
-                            </div>
-                            <div class="metric">
-                                <div class="metric-label">Trades Today</div>
-                                <div class="metric-value">${strategy.trades_today}</div>
-                            </div>
-                            <div class="metric">
-                                <div class="metric-label">Opportunities</div>
-                                <div class="metric-value">${strategy.opportunities_count}</div>
-                            </div>
-                        </div>
-                        
-                        <div class="controls">
-                            <button class="btn btn-primary" onclick="setBalance('${strategyName}')">💰 Set Balance</button>
-                            <button class="btn btn-danger" onclick="resetStrategy('${strategyName}')">🔄 Reset</button>
-                            <button class="btn btn-success" onclick="viewTrades('${strategyName}')">📊 Trades</button>
-                            <button class="btn btn-warning" onclick="viewPositions('${strategyName}')">📈 Positions</button>
-                        </div>
-                    `;
-                    
-                    return card;
-                }
-                
-                function updateOpportunities(strategies) {
-                    const container = document.getElementById('opportunities');
-                    
-                    // Fetch opportunities directly from the API
-                    fetch('/api/opportunities')
-                        .then(response => response.json())
-                        .then(data => {
-                            if (data.error) {
-                                container.innerHTML = `<div class="error-message">Error: ${data.error}</div>`;
-                                return;
-                            }
-                            
-                            if (data.length === 0) {
-                                container.innerHTML = '<div class="no-opportunities">No opportunities or recent trades available.</div>';
-                                return;
-                            }
-                            
-                            // Check if it's an info message
-                            if (data.length === 1 && data[0].type === 'info') {
-                                container.innerHTML = `<div class="no-opportunities">${data[0].message}</div>`;
-                                return;
-                            }
-                            
-                            // Display opportunities or recent trades
-                            let html = '';
-                            data.forEach(item => {
-                                if (item.type === 'opportunity') {
-                                    html += `
-                                        <div class="opportunity-item">
-                                            <span><strong>${item.symbol}</strong> - $${item.current_price.toFixed(2)}</span>
-                                            <span>Score: ${item.score.toFixed(3)} | Risk: ${item.risk_score.toFixed(3)}</span>
-                                        </div>
-                                    `;
-                                } else if (item.type === 'recent_trade') {
-                                    html += `
-                                        <div class="opportunity-item">
-                                            <span><strong>${item.symbol}</strong> - ${item.shares} shares @ $${item.price.toFixed(2)}</span>
-                                            <span>${item.strategy} | ${item.timestamp}</span>
-                                        </div>
-                                    `;
-                                }
-                            });
-                            
-                            if (html === '') {
-                                html = '<div class="no-opportunities">No opportunities or recent trades available.</div>';
+                    )
+
+            # If no current opportunities, get recent trades from all strategies
+            if not opportunities:
+                try:
+                    rows = self._query(
+                        self._db_path,
+                        """
+                        SELECT symbol, shares, price, printf('%.2f', price) AS price_str,
+                               total, 'recent_trade' AS type,
+                               timestamp, COALESCE(opportunity_score, 0.0) AS score,
+                               COALESCE(risk_score, 0.0) AS risk_score, strategy
+                        FROM trades
+                        ORDER BY timestamp DESC
+                        LIMIT 15
+                        """,
+                    )
+                    opportunities.extend(dict(row) for row in rows)
+                except Exception as e:
+                    logger.error("Error getting trades from main database: %s", e)
+                    # Add placeholder opportunities for each strategy
+                    for strategy_name in self.trading_agent.strategies.keys():
+                        opportunities.append(
+                            {
+                                "symbol": "N/A",
+                                "shares": 0,
+                                "price": 0.0,
+                                "total": 0.0,
+                                "type": "No trades yet",
+                                "timestamp": "New deployment",
+                                "score": 0.0,
+                                "risk_score": 0.0,
+                                "strategy": strategy_name,
+                                "type": "info",
+                                "message": f"{strategy_name} strategy is running but no trades yet. Database will be created on first trade.",
                             }
-                            
-                            container.innerHTML = html;
-                        })
-                        .catch(error => {
-                            console.error('Error fetching opportunities:', error);
-                            container.innerHTML = '<div class="no-opportunities">Error loading opportunities. Please try again.</div>';
-                        });
-                }
-                
-                async function setBalance(strategyName) {
-                    const newBalance = prompt(`Enter new balance for ${strategyName}:`, "10000");
-                    if (newBalance && !isNaN(newBalance)) {
-                        try {
-                            const response = await fetch(`/api/set-balance/${strategyName}`, {
-                                method: 'POST',
-                                headers: { 'Content-Type': 'application/json' },
-                                body: JSON.stringify({ balance: parseFloat(newBalance) })
-                            });
-                            const result = await response.json();
-                            alert(`Balance updated for ${strategyName}: $${result.new_balance.toFixed(2)}`);
-                        } catch (error) {
-                            alert('Error setting balance: ' + error);
-                        }
-                    }
-                }
-                
-                async function resetStrategy(strategyName) {
-                    if (confirm(`Are you sure you want to reset ${strategyName}? This will delete all positions and trades.`)) {
-                        try {
-                            const response = await fetch(`/api/reset/${strategyName}`, { method: 'POST' });
-                            const result = await response.json();
-                            alert(`${strategyName} reset successfully! New balance: $${result.new_balance.toFixed(2)}`);
-                            location.reload();
-                        } catch (error) {
-                            alert('Error resetting strategy: ' + error);
-                        }
+                        )
+
+            # If still no data, return a message
+            if not opportunities:
+                return [
+                    {
+                        "symbol": "No opportunities",
+                        "message": "No current opportunities available. Trading cycle completed. Check back after the next research cycle.",
+                        "type": "info",
                     }
-                }
-                
-                function viewTrades(strategyName) {
-                    window.open(`/api/trades/${strategyName}`, '_blank');
-                }
-                
-                function viewPositions(strategyName) {
-                    window.open(`/api/positions/${strategyName}`, '_blank');
-                }
-                
-                // Initialize
-                connectWebSocket();
-                fetchStrategies();
-            </script>
-        </body>
-        </html>
-        """
+                ]
+
+            return opportunities
+        except Exception as e:
+            logger.error("Error getting opportunities: %s", e)
+            return {"error": str(e)}
+
+    def get_dashboard_html(self) -> str:
+        return _DASHBOARD_HTML
 
     async def start(self):
         """Start the web dashboard"""
         try:
-            logger.info(f"Starting web dashboard...")
-            logger.info(f"Trading agent config: {self.trading_agent.config}")
-            logger.info(
-                f"Dashboard host: {self.trading_agent.config.system.dashboard_host}"
-            )
-            logger.info(
-                f"Dashboard port: {self.trading_agent.config.system.dashboard_port}"
-            )
+            # uvicorn only logs warnings, so say where the dashboard listens
+            system = self.trading_agent.config.system
+            if system.dashboard_uds:
+                # A proxy on the same host reaches us without the TCP stack
+                bind = {"uds": system.dashboard_uds}
+                logger.info("Starting web dashboard on %s", system.dashboard_uds)
+            else:
+                bind = {"host": system.dashboard_host, "port": system.dashboard_port}
+                logger.info(
+                    "Starting web dashboard on %s:%s",
+                    system.dashboard_host,
+                    system.dashboard_port,
+                )
+            logger.debug("Trading agent config: %s", self.trading_agent.config)
 
             config = uvicorn.Config(
                 self.app,
-                host=self.trading_agent.config.system.dashboard_host,
-                port=self.trading_agent.config.system.dashboard_port,
-                log_level="info",
+                **bind,
+                log_level="warning",
+                # Picks httptools' C parser when it is installed. The server
+                # runs on the agent's own (uvloop) event loop, and stays a
+                # single worker because the routes read in-process state.
+                http="auto",
+                # No per-request access log lines for the polled endpoints
+                access_log=False,
+                backlog=2048,
             )
-            server = uvicorn.Server(config)
-            await server.serve()
+            self._server = uvicorn.Server(config)
+            await self._server.serve()
         except Exception as e:
-            logger.error(f"Error starting web dashboard: {e}")
+            logger.error("Error starting web dashboard: %s", e)
             raise
 
+    def stop(self):
+        """Ask the server to finish in-flight requests and return from start()"""
+        if self._server is not None:
+            self._server.should_exit = True
+
     async def shutdown(self):
         """Shutdown the web dashboard"""
+        if self._broadcast_task is not None:
+            self._broadcast_task.cancel()
+        if self._config_flush_task is not None:
+            await self._config_flush_task  # Writes every pending balance change
+        with self._conns_lock:
+            for conn in self._conns.values():
+                conn.close()
+            self._conns.clear()
         logger.info("🛑 Web dashboard shutdown complete")
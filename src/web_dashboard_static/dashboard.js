@@ -0,0 +1,321 @@
+let ws = null;
+
+// Set by the first WebSocket status; a later /api/bootstrap reply is older
+let statusReceived = false;
+
+// Latest status waiting to be painted, and the frame that will paint it.
+// Updates arriving within one frame collapse into a single repaint
+let pendingStatus = null;
+let pendingFrame = null;
+
+function scheduleUpdate(data) {
+    pendingStatus = data;
+    if (pendingFrame === null) {
+        pendingFrame = requestAnimationFrame(() => {
+            pendingFrame = null;
+            updateDashboard(pendingStatus);
+        });
+    }
+}
+
+// Calls sent over the WebSocket and waiting for their reply, by id
+let rpcSeq = 0;
+const rpcPending = new Map();
+
+function rpc(method, params, url) {
+    // Use the open socket when there is one; otherwise fall back to REST
+    if (!ws || ws.readyState !== WebSocket.OPEN) {
+        return fetch(url, {
+            method: 'POST',
+            headers: { 'Content-Type': 'application/json' },
+            body: JSON.stringify(params)
+        }).then(response => response.json());
+    }
+    const id = ++rpcSeq;
+    return new Promise((resolve, reject) => {
+        rpcPending.set(id, { resolve, reject });
+        ws.send(JSON.stringify({ id, method, params }));
+    });
+}
+
+function connectWebSocket() {
+    // Same host and port as the page, so it works behind $PORT, https and proxies
+    ws = new WebSocket(`${location.protocol === 'https:' ? 'wss' : 'ws'}://${location.host}/ws`);
+
+    ws.onopen = function() {
+        console.log('WebSocket connected');
+    };
+
+    ws.onmessage = function(event) {
+        const data = JSON.parse(event.data);
+        if (data.id !== undefined) {
+            const call = rpcPending.get(data.id);
+            rpcPending.delete(data.id);
+            if (call && data.error !== undefined) call.reject(new Error(data.error));
+            else if (call) call.resolve(data.result);
+            return;
+        }
+        statusReceived = true;
+        scheduleUpdate(data);
+    };
+
+    ws.onclose = function() {
+        for (const call of rpcPending.values()) call.reject(new Error('WebSocket closed'));
+        rpcPending.clear();
+        console.log('WebSocket disconnected, reconnecting...');
+        setTimeout(connectWebSocket, 5000);
+    };
+}
+
+async function bootstrap() {
+    // One request for the first render; the WebSocket keeps it fresh
+    try {
+        const response = await fetch('/api/bootstrap');
+        const data = await response.json();
+        if (data.strategies.error) {
+            document.getElementById('error-message').innerText = data.strategies.error;
+            document.getElementById('error-message').style.display = 'block';
+            document.getElementById('strategies').style.display = 'none';
+        } else {
+            document.getElementById('error-message').style.display = 'none';
+            document.getElementById('strategies').style.display = 'grid';
+        }
+        if (!statusReceived) {
+            scheduleUpdate({ strategies: data.status.strategies, opportunities: data.opportunities });
+        }
+    } catch (e) {
+        document.getElementById('error-message').innerText = 'Error loading strategies: ' + e;
+        document.getElementById('error-message').style.display = 'block';
+        document.getElementById('strategies').style.display = 'none';
+    }
+}
+
+function updateDashboard(data) {
+    updateStrategies(data.strategies);
+    renderOpportunities(data.opportunities);
+}
+
+function updateStrategies(strategies) {
+    const container = document.getElementById('strategies');
+    container.innerHTML = '';
+
+    for (const [strategyName, strategy] of Object.entries(strategies)) {
+        const card = createStrategyCard(strategyName, strategy);
+        container.appendChild(card);
+    }
+}
+
+function createStrategyCard(strategyName, strategy) {
+    const card = document.createElement('div');
+    card.className = `strategy-card ${strategyName}`;
+
+    const isActive = strategy.is_active;
+    const statusClass = isActive ? 'status-active' : 'status-inactive';
+    const statusText = isActive ? 'ACTIVE' : 'INACTIVE';
+
+    const pnlClass = strategy.daily_pnl >= 0 ? 'positive' : 'negative';
+    const pnlSign = strategy.daily_pnl >= 0 ? '+' : '';
+
+    card.innerHTML = `
+        <div class="strategy-header">
+            <div class="strategy-name">${strategy.name || strategyName.toUpperCase()}</div>
+            <div class="strategy-status ${statusClass}">${statusText}</div>
+        </div>
+
+        <div class="metrics">
+            <div class="metric">
+                <div class="metric-label">Account Balance</div>
+                <div class="metric-value">$${strategy.account_balance.toFixed(2)}</div>
+            </div>
+            <div class="metric">
+                <div class="metric-label">Daily P&L</div>
+                <div class="metric-value ${pnlClass}">${pnlSign}$${strategy.daily_pnl.toFixed(2)}</div>
+            </div>
+            <div class="metric">
+                <div class="metric-label">Total P&L</div>
+                <div class="metric-value ${pnlClass}">${pnlSign}$${strategy.total_pnl.toFixed(2)}</div>
+            </div>
+            <div class="metric">
+                <div class="metric-label">Positions</div>
+                <div class="metric-value">${strategy.positions_count}</div>
+            </div>
+            <div class="metric">
+                <div class="metric-label">Trades Today</div>
+                <div class="metric-value">${strategy.trades_today}</div>
+            </div>
+            <div class="metric">
+                <div class="metric-label">Opportunities</div>
+                <div class="metric-value">${strategy.opportunities_count}</div>
+            </div>
+        </div>
+
+        <div class="controls">
+            <button class="btn btn-primary" onclick="setBalance('${strategyName}')">💰 Set Balance</button>
+            <button class="btn btn-danger" onclick="resetStrategy('${strategyName}')">🔄 Reset</button>
+            <button class="btn btn-success" onclick="viewTrades('${strategyName}')">📊 Trades</button>
+            <button class="btn btn-warning" onclick="viewPositions('${strategyName}')">📈 Positions</button>
+        </div>
+    `;
+
+    return card;
+}
+
+function messageNode(className, text) {
+    const node = document.createElement('div');
+    node.className = className;
+    node.textContent = text;
+    return node;
+}
+
+// Shown whenever there is nothing to list; built once and reused
+const noOpportunitiesNode = messageNode('no-opportunities', 'No opportunities or recent trades available.');
+
+function opportunityText(item) {
+    // [label, detail] for an opportunity or recent trade; null for other types.
+    // Numbers arrive already formatted by the server
+    if (item.type === 'opportunity') {
+        return [
+            ` - $${item.price_str}`,
+            `Score: ${item.score_str} | Risk: ${item.risk_str}`,
+        ];
+    }
+    if (item.type === 'recent_trade') {
+        return [
+            ` - ${item.shares} shares @ $${item.price_str}`,
+            `${item.strategy} | ${item.timestamp}`,
+        ];
+    }
+    return null;
+}
+
+function opportunityRow(item, label, detail) {
+    const symbol = document.createElement('strong');
+    symbol.textContent = item.symbol;
+    const labelText = document.createTextNode(label);
+    const left = document.createElement('span');
+    left.append(symbol, labelText);
+    const right = document.createElement('span');
+    right.textContent = detail;
+
+    const node = document.createElement('div');
+    node.className = 'opportunity-item';
+    node.append(left, right);
+    return { node, label: labelText, detail: right, sig: label + '|' + detail };
+}
+
+// Rows currently shown, by key, so unchanged rows are left untouched
+const oppCache = new Map();
+
+function showOpportunitiesMessage(container, node) {
+    oppCache.clear();
+    container.replaceChildren(node);
+}
+
+function renderOpportunities(data) {
+    const container = document.getElementById('opportunities');
+
+    if (data.error) {
+        showOpportunitiesMessage(container, messageNode('error-message', `Error: ${data.error}`));
+        return;
+    }
+
+    // Check if it's an info message
+    if (data.length === 1 && data[0].type === 'info') {
+        showOpportunitiesMessage(container, messageNode('no-opportunities', data[0].message));
+        return;
+    }
+
+    // Match items to existing rows; only changed text is written
+    const seen = new Set();
+    const rows = [];
+    for (const item of data) {
+        const text = opportunityText(item);
+        if (!text) continue;
+        const [label, detail] = text;
+
+        const base = item.type === 'recent_trade'
+            ? `${item.type}|${item.symbol}|${item.strategy}|${item.timestamp}`
+            : `${item.type}|${item.symbol}`;
+        let key = base;
+        for (let n = 1; seen.has(key); n++) key = `${base}#${n}`;
+        seen.add(key);
+
+        let entry = oppCache.get(key);
+        if (!entry) {
+            entry = opportunityRow(item, label, detail);
+            oppCache.set(key, entry);
+        } else if (entry.sig !== label + '|' + detail) {
+            entry.label.textContent = label;
+            entry.detail.textContent = detail;
+            entry.sig = label + '|' + detail;
+        }
+        rows.push(entry.node);
+    }
+
+    for (const [key, entry] of oppCache) {
+        if (!seen.has(key)) {
+            entry.node.remove();
+            oppCache.delete(key);
+        }
+    }
+
+    if (rows.length === 0) {
+        container.replaceChildren(noOpportunitiesNode);
+        return;
+    }
+
+    // Move rows only where the order changed, then drop anything left over
+    let cursor = container.firstChild;
+    for (const node of rows) {
+        if (node === cursor) {
+            cursor = node.nextSibling;
+        } else {
+            container.insertBefore(node, cursor);
+        }
+    }
+    while (cursor) {
+        const next = cursor.nextSibling;
+        cursor.remove();
+        cursor = next;
+    }
+}
+
+async function setBalance(strategyName) {
+    const newBalance = prompt(`Enter new balance for ${strategyName}:`, "10000");
+    if (newBalance && !isNaN(newBalance)) {
+        try {
+            const result = await rpc(
+                'set_balance',
+                { strategy_name: strategyName, balance: parseFloat(newBalance) },
+                `/api/set-balance/${strategyName}`
+            );
+            // The server pushes the updated status over the WebSocket
+            if (result.error) alert('Error setting balance: ' + result.error);
+        } catch (error) {
+            alert('Error setting balance: ' + error);
+        }
+    }
+}
+
+async function resetStrategy(strategyName) {
+    if (confirm(`Are you sure you want to reset ${strategyName}? This will delete all positions and trades.`)) {
+        try {
+            const result = await rpc('reset', { strategy_name: strategyName }, `/api/reset/${strategyName}`);
+            if (result.error) alert('Error resetting strategy: ' + result.error);
+        } catch (error) {
+            alert('Error resetting strategy: ' + error);
+        }
+    }
+}
+
+function viewTrades(strategyName) {
+    window.open(`/api/trades/${strategyName}`, '_blank');
+}
+
+function viewPositions(strategyName) {
+    window.open(`/api/positions/${strategyName}`, '_blank');
+}
+
+// Initialize
+connectWebSocket();
+bootstrap();
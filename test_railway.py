@@ -5,6 +5,7 @@ Simple test for Railway deployment
 
 import os
 import logging
+import time
 from fastapi import FastAPI
 import uvicorn
 
@@ -14,6 +15,11 @@ logger = logging.getLogger(__name__)
 
 app = FastAPI()
 
+# Directory listing for /api/test, reused while "." is unchanged (by mtime)
+# and for at most _DIR_CACHE_TTL seconds
+_DIR_CACHE_TTL = 1.0
+_dir_cache = {"mtime": None, "ts": 0.0, "files": []}
+
 
 @app.get("/")
 async def root():
@@ -27,10 +33,20 @@ async def version():
 
 @app.get("/api/test")
 async def test():
-    return {"status": "working", "files": os.listdir(".")}
+    mtime = os.stat(".").st_mtime_ns
+    now = time.monotonic()
+    if mtime != _dir_cache["mtime"] or now - _dir_cache["ts"] >= _DIR_CACHE_TTL:
+        _dir_cache.update(mtime=mtime, ts=now, files=os.listdir("."))
+    return {"status": "working", "files": _dir_cache["files"]}
 
 
 if __name__ == "__main__":
-    port = int(os.environ.get("PORT", 8000))
-    logger.info(f"Starting test server on port {port}")
-    uvicorn.run(app, host="0.0.0.0", port=port)
+    uds = os.environ.get("UDS_PATH")
+    if uds:
+        # Behind a proxy on the same host; Railway itself needs TCP on $PORT
+        logger.info(f"Starting test server on {uds}")
+        uvicorn.run(app, uds=uds)
+    else:
+        port = int(os.environ.get("PORT", 8000))
+        logger.info(f"Starting test server on port {port}")
+        uvicorn.run(app, host="0.0.0.0", port=port)